@@ -0,0 +1,86 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _depth_kernel(distances, n_v, n_h, min_t, max_t, mirror, levels,
+                  mask_out, normalized_out, presence_out, char_out):
+    """
+    Single pass over the depth grid producing the threshold mask, position
+    within threshold range (0.0 - 1.0), per-column presence (0/1) and console
+    character index (0 - levels) for every cell.
+    """
+    inv_range = 1.0 / (max_t - min_t)
+    scale = levels * inv_range
+    for j in range(n_h):
+        presence_out[j] = 0
+
+    for i in range(n_v):
+        for j in range(n_h):
+            src = n_h - 1 - j if mirror else j
+            value = distances[i * n_h + src]
+            if min_t <= value <= max_t:
+                mask_out[i, j] = True
+                normalized_out[i, j] = (value - min_t) * inv_range
+                presence_out[j] = 1
+                char_out[i, j] = int((value - min_t) * scale)
+            else:
+                mask_out[i, j] = False
+                normalized_out[i, j] = 0.0
+                char_out[i, j] = 0
+
+
+_NORMALIZE_SOURCE = """
+def normalize(heatmap, mask_out, normalized_out):
+    np.greater_equal(heatmap, {min_t!r}, out=mask_out)
+    mask_out &= heatmap <= {max_t!r}
+    np.subtract(heatmap, {min_t!r}, out=normalized_out)
+    normalized_out *= {inv_range!r}
+    np.copyto(normalized_out, 0, where=~mask_out)
+"""
+
+# Normalizers specialized for each (min, max) threshold pair seen so far
+_normalizers = {}
+
+
+def _get_normalizer(min_t, max_t):
+    """Return normalize(heatmap, mask_out, normalized_out) with thresholds baked in as constants."""
+    key = (min_t, max_t)
+    normalize = _normalizers.get(key)
+    if normalize is None:
+        namespace = {'np': np}
+        source = _NORMALIZE_SOURCE.format(min_t=float(min_t), max_t=float(max_t),
+                                          inv_range=1.0 / (max_t - min_t))
+        exec(source, namespace)
+        normalize = _normalizers[key] = namespace['normalize']
+    return normalize
+
+
+def _depth_kernel_numpy(distances, n_v, n_h, min_t, max_t, mirror, levels,
+                        mask_out, normalized_out, presence_out, char_out):
+    """NumPy fallback for _depth_kernel when numba is not installed."""
+    heatmap = distances.reshape(n_v, n_h)
+    if mirror:
+        heatmap = heatmap[:, ::-1]
+
+    # Threshold once; presence and shades are derived from the normalized grid
+    _get_normalizer(min_t, max_t)(heatmap, mask_out, normalized_out)
+    np.any(mask_out, axis=0, out=presence_out.view(bool))
+    char_out.fill(0)
+    np.multiply(normalized_out, levels, out=char_out, where=mask_out, casting='unsafe')
+
+
+if njit is not None:
+    # No 'nnan'/'ninf' fast-math flags: dropped sensor readings arrive as NaN/inf
+    # and must fail the range check
+    depth_kernel = njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})(_depth_kernel)
+
+    # Pay the JIT compilation cost once at import time
+    depth_kernel(np.zeros(1, dtype=np.float32), 1, 1, 0.0, 1.0, False, 1,
+                 np.zeros((1, 1), dtype=bool), np.zeros((1, 1), dtype=np.float32),
+                 np.zeros(1, dtype=np.uint8), np.zeros((1, 1), dtype=np.int8))
+else:
+    depth_kernel = _depth_kernel_numpy
\ No newline at end of file
@@ -4,22 +4,11 @@ class ColumnAnalyzer:
     def __init__(self, config):
         self.config = config
 
-    def analyze_columns(self, distances, mirror=True):
+    def analyze_columns(self, frame):
         """
         Analyze columns for object presence and return binary representation.
-        Returns array where 1 indicates object presence in column, 0 indicates no object.
+        Returns int bitmask where bit i set indicates object presence in column i.
         """
-        heatmap = np.array(distances).reshape(self.config.nV, self.config.nH)
-        if mirror:
-            heatmap = np.fliplr(heatmap)
-        
-        # Create mask for values between thresholds
-        mask = (heatmap >= self.config.MIN_THRESHOLD) & (heatmap <= self.config.MAX_THRESHOLD)
-        
-        # Check each column for object presence
-        column_presence = np.zeros(self.config.nH, dtype=int)
-        for col in range(self.config.nH):
-            if np.any(mask[:, col]):
-                column_presence[col] = 1
-        
-        return column_presence
\ No newline at end of file
+        # Per-column presence is computed by the depth kernel when the frame was built
+        packed = np.packbits(frame.presence, bitorder='little')
+        return int.from_bytes(packed.tobytes(), 'little')
\ No newline at end of file
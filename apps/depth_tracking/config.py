@@ -4,11 +4,15 @@ class Config:
         self.MIN_THRESHOLD = 0.4  # 40 cm
         self.MAX_THRESHOLD = 1.8  # 1.8 meters
 
+        # Stereo configuration
+        self.SUBPIXEL = False  # Subpixel disparity, finer depth at ~1/3 lower spatial calculator FPS
+
         # Display configuration
         self.DISPLAY_WINDOW = False       # CV2 window display flag
         self.SHOW_CONSOLE_PREVIEW = True  # Preview
         self.SHOW_STATS = True            # Statistics display flag
         self.MIRROR_MODE = True           # Mirror mode flag
+        self.CONSOLE_CHARS = ' ░▒▓█'      # Console preview shades (near to far)
         
         # Timing configuration
         self.UI_REFRESH_INTERVAL = 0.04  # how often to refresh UI (40ms)
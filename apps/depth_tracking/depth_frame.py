@@ -0,0 +1,50 @@
+import numpy as np
+
+from ._kernels import depth_kernel
+
+
+class DepthFrame:
+    """
+    Per-frame view of the depth grid shared by the analyzer and visualizer.
+    Built once per frame so consumers don't each reshape, mirror and threshold
+    the same distances. Arrays are read-only.
+    """
+    __slots__ = ('heatmap', 'mask', 'normalized', 'presence', 'char_idx')
+
+    def __init__(self, heatmap, mask, normalized, presence, char_idx):
+        self.heatmap = heatmap
+        self.mask = mask
+        self.normalized = normalized
+        self.presence = presence
+        self.char_idx = char_idx
+
+    @classmethod
+    def from_distances(cls, distances, config, mirror=True):
+        """
+        Build frame from flat distances (in meters). Contiguous float32 buffers
+        (bytes, bytearray, memoryview) are wrapped without copying.
+        """
+        if isinstance(distances, (bytes, bytearray, memoryview)):
+            distances = np.frombuffer(distances, dtype=np.float32)
+        else:
+            distances = np.asarray(distances, dtype=np.float32)
+        heatmap = distances.reshape(config.nV, config.nH)
+        if mirror:
+            heatmap = heatmap[:, ::-1]
+
+        min_t = config.MIN_THRESHOLD
+        max_t = config.MAX_THRESHOLD
+
+        # Threshold mask, position within threshold range (0.0 - 1.0, 0 outside
+        # of it), column presence and console shades in one compiled pass
+        mask = np.empty((config.nV, config.nH), dtype=bool)
+        normalized = np.empty((config.nV, config.nH), dtype=np.float32)
+        presence = np.empty(config.nH, dtype=np.uint8)
+        char_idx = np.empty((config.nV, config.nH), dtype=np.int8)
+        depth_kernel(distances, config.nV, config.nH, float(min_t), float(max_t), bool(mirror),
+                     len(config.CONSOLE_CHARS) - 1, mask, normalized, presence, char_idx)
+
+        for array in (heatmap, mask, normalized, presence, char_idx):
+            array.flags.writeable = False
+
+        return cls(heatmap, mask, normalized, presence, char_idx)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import time
+import numpy as np
 
 from .config import Config
 
@@ -14,58 +15,81 @@ class DepthTracker:
         self.threshold_time = 3.0  # seconds required before starting to count
         self.increment_interval = self.config.COUNTER_INCREMENT_INTERVAL
         
-        # Tracking dictionaries
-        self.position_timers = {}  # when position became active
-        self.last_increment_time = {}  # when position was last incremented
-        self.position_counters = [0] * 10  # counters for all 10 positions
+        # Tracking arrays, one slot per position (NaN while position is inactive)
+        positions = self.config.nH
+        self.timer_start = np.full(positions, np.nan)  # when position became active
+        self.last_increment_time = np.full(positions, np.nan)  # when position was last incremented
+        self.position_counters = np.zeros(positions, dtype=np.int64)  # counters for all positions
+        self._positions = np.arange(positions)
         
         # Logging configuration
-        self.last_log_state = None
+        self._version = 0  # bumped on every counter increment
+        self._logged_version = -1
         self.log_filename = 'tmpl.log'
         
-        # Initialize log file
-        with open(self.log_filename, 'w') as f:
-            f.write('')  # Clear/create file
+        self._init_log_file()
 
-    def update(self, column_presence):
+    def _init_log_file(self):
+        """Clear/create log file and keep a line-buffered handle open for writes"""
+        self._log_fp = open(self.log_filename, 'w', buffering=1)
+
+    def close(self):
+        """Close the log file handle"""
+        if not self._log_fp.closed:
+            self._log_fp.close()
+
+    def __del__(self):
+        if hasattr(self, '_log_fp'):
+            self.close()
+
+    def update(self, presence_bits: int):
         """
         Updates tracking state and generates log if needed.
         
         Args:
-            column_presence: List of binary values indicating presence (1) or absence (0)
+            presence_bits: Bitmask where bit i set indicates presence in position i
         """
         current_time = time.time()
+        presence = ((presence_bits >> self._positions) & 1).astype(bool)
+
+        # Reset timers for positions that are no longer active
+        absent = ~presence
+        self.timer_start[absent] = np.nan
+        self.last_increment_time[absent] = np.nan
+
+        # Start tracking newly active positions
+        newly_active = presence & np.isnan(self.timer_start)
+        self.timer_start[newly_active] = current_time
+        self.last_increment_time[newly_active] = current_time
 
-        # Check all positions (0-9)
-        for i in range(10):
-            if i < len(column_presence):
-                if column_presence[i] == 1:
-                    # Start tracking if position is newly active
-                    if i not in self.position_timers:
-                        self.position_timers[i] = current_time
-                        self.last_increment_time[i] = current_time
-                    else:
-                        # Check if we've passed initial threshold and increment interval
-                        time_active = current_time - self.position_timers[i]
-                        time_since_last_increment = current_time - self.last_increment_time[i]
-                        
-                        if (time_active >= self.threshold_time and 
-                            time_since_last_increment >= self.increment_interval):
-                            # Increment counter and update last increment time
-                            self.position_counters[i] += 1
-                            self.last_increment_time[i] = current_time
-                            # Log state immediately after increment
-                            self.log_state()
-                else:
-                    # Reset timers if position is no longer active
-                    if i in self.position_timers:
-                        del self.position_timers[i]
-                        del self.last_increment_time[i]
+        # Positions still active that passed initial threshold and increment interval
+        increment = (presence
+                     & (current_time - self.timer_start >= self.threshold_time)
+                     & (current_time - self.last_increment_time >= self.increment_interval))
+
+        if increment.any():
+            # Increment counters and update last increment time
+            self.position_counters[increment] += 1
+            self.last_increment_time[increment] = current_time
+            self._version += 1
+            # Log state immediately after increment
+            self.log_state()
+
+    @property
+    def active_positions(self):
+        """Indices of positions currently being tracked"""
+        return np.flatnonzero(~np.isnan(self.timer_start)).tolist()
+
+    def reset_counters(self):
+        """Zero all position counters"""
+        self.position_counters.fill(0)
+        self._version += 1
 
     def log_state(self):
         """Logs the current state of counters to file"""
-        current_state = self.position_counters
-        if current_state != self.last_log_state:
-            with open(self.log_filename, 'a') as f:
-                f.write(f"{current_state}\n")
-            self.last_log_state = current_state.copy()
\ No newline at end of file
+        if self._version == self._logged_version:
+            return
+
+        # Same format as list repr, read back by FileMonitor via literal_eval
+        self._log_fp.write("[" + ", ".join(map(str, self.position_counters.tolist())) + "]\n")
+        self._logged_version = self._version
\ No newline at end of file
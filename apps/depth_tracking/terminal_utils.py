@@ -1,3 +1,4 @@
+import os
 import sys
 import select
 import tty
@@ -5,9 +6,9 @@ import termios
 
 class TerminalUtils:
     @staticmethod
-    def is_data():
-        """Check if there is data available on stdin."""
-        return select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], [])
+    def is_data(timeout: float = 0):
+        """Check if there is data available on stdin, waiting at most timeout seconds."""
+        return select.select([sys.stdin], [], [], timeout) == ([sys.stdin], [], [])
 
     @staticmethod
     def get_key():
@@ -16,6 +17,13 @@ class TerminalUtils:
             return sys.stdin.read(1)
         return None
 
+    @staticmethod
+    def get_keys(timeout: float = 0) -> bytes:
+        """Drain all pending keypresses from stdin in one read (raw mode)."""
+        if not TerminalUtils.is_data(timeout):
+            return b""
+        return os.read(sys.stdin.fileno(), 64)
+
     @staticmethod
     def init_terminal():
         """Initialize terminal for raw input."""
@@ -40,24 +48,25 @@ class TerminalUtils:
     def move_cursor(x: int, y: int):
         """Move terminal cursor to specified position."""
         sys.stdout.write(f"\033[{y};{x}H")
-        sys.stdout.flush()
 
     @staticmethod
     def clear_screen():
         """Clear entire screen."""
         sys.stdout.write("\033[2J")
-        sys.stdout.flush()
 
     @staticmethod
     def hide_cursor():
         """Hide terminal cursor."""
         sys.stdout.write("\033[?25l")
-        sys.stdout.flush()
 
     @staticmethod
     def show_cursor():
         """Show terminal cursor."""
         sys.stdout.write("\033[?25h")
+
+    @staticmethod
+    def flush():
+        """Flush pending terminal output."""
         sys.stdout.flush()
 
 class TerminalContext:
@@ -71,6 +80,7 @@ class TerminalContext:
         if self.hide_cursor:
             TerminalUtils.hide_cursor()
         TerminalUtils.clear_screen()
+        TerminalUtils.flush()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -78,4 +88,5 @@ class TerminalContext:
             TerminalUtils.show_cursor()
         if self.old_settings:
             TerminalUtils.restore_terminal(self.old_settings)
-        TerminalUtils.clear_screen()
\ No newline at end of file
+        TerminalUtils.clear_screen()
+        TerminalUtils.flush()
\ No newline at end of file
@@ -9,99 +9,121 @@ class Visualizer:
         self.config = config
         self.frame_initialized = False
         
-    def create_buffer(self) -> list[list[str]]:
-        return [[" " for _ in range(self.config.nH)] for _ in range(self.config.nV)]
-
-    def create_heatmap(self, distances, mirror=True):
-        """Create a CV2 heatmap visualization of the depth data."""
-        heatmap = np.array(distances).reshape(self.config.nV, self.config.nH)
+        # Grid dimensions are fixed for the lifetime of the visualizer
+        self.nH = config.nH
+        self.nV = config.nV
+        scale_factor = 80
+        self._heatmap_size = (self.nH * scale_factor, self.nV * scale_factor)
         
-        if mirror:
-            heatmap = np.fliplr(heatmap)
+        # Scratch buffers reused on every frame
+        grid_shape = (self.nV, self.nH)
+        self._normalized = np.empty(grid_shape, dtype=np.uint8)
+        self._colored = np.empty(grid_shape + (3,), dtype=np.uint8)
         
-        mask = (heatmap >= self.config.MIN_THRESHOLD) & (heatmap <= self.config.MAX_THRESHOLD)
+        # Console shades as codepoints, indexed by the depth kernel's char index
+        self._char_codes = np.array([ord(c) for c in config.CONSOLE_CHARS], dtype=np.uint32)
         
-        normalized = np.zeros_like(heatmap)
-        normalized[mask] = ((heatmap[mask] - self.config.MIN_THRESHOLD) / 
-                        (self.config.MAX_THRESHOLD - self.config.MIN_THRESHOLD) * 255)
-        normalized = normalized.astype(np.uint8)
+        # Preformatted cursor-move + color output for every (row, column, shade)
+        self._cell_codes = [
+            [
+                [f"\033[{i + 2};{j * 2 + 2}H\033[94m{c}\033[0m ".encode() for c in config.CONSOLE_CHARS]
+                for j in range(self.nH)
+            ]
+            for i in range(self.nV)
+        ]
         
-        heatmap_colored = cv2.applyColorMap(normalized, cv2.COLORMAP_JET)
-        heatmap_colored[~mask] = [0, 0, 0]
+        # Single-slot cache of the last scaled heatmap
+        self._last_signature = None
+        self._last_scaled = None
         
-        scale_factor = 80
-        heatmap_scaled = cv2.resize(heatmap_colored, 
-                                (self.config.nH * scale_factor, self.config.nV * scale_factor), 
+        # Shade map last drawn to the console
+        self._last_console_signature = None
+        
+    def create_buffer(self) -> np.ndarray:
+        """Console buffer of displayed codepoints, initially blank"""
+        return np.full((self.nV, self.nH), ord(" "), dtype=np.uint32)
+
+    def create_heatmap(self, frame):
+        """Create a CV2 heatmap visualization of the depth data."""
+        mask_u8 = frame.mask.view(np.uint8)
+        np.multiply(frame.normalized, 255, out=self._normalized, casting='unsafe')
+        
+        # Scene unchanged since last frame - reuse previous result
+        signature = self._normalized.tobytes() + mask_u8.tobytes()
+        if signature == self._last_signature:
+            return self._last_scaled
+        
+        heatmap_colored = cv2.applyColorMap(self._normalized, cv2.COLORMAP_JET, dst=self._colored)
+        heatmap_colored *= mask_u8[:, :, None]
+        
+        heatmap_scaled = cv2.resize(heatmap_colored, self._heatmap_size,
                                 interpolation=cv2.INTER_NEAREST)
         
+        self._last_signature = signature
+        self._last_scaled = heatmap_scaled
         return heatmap_scaled
 
-    def create_console_heatmap(self, distances, prev_buffer, mirror=True):
+    def create_console_heatmap(self, frame, prev_buffer):
         """Create and update console-based heatmap visualization."""
         if not self.config.SHOW_CONSOLE_PREVIEW:
             return prev_buffer
 
-        heatmap = np.array(distances).reshape(self.config.nV, self.config.nH)
-        
-        if mirror:
-            heatmap = np.fliplr(heatmap)
-        
-        mask = (heatmap >= self.config.MIN_THRESHOLD) & (heatmap <= self.config.MAX_THRESHOLD)
-        normalized = np.zeros_like(heatmap, dtype=float)
-        normalized[mask] = ((heatmap[mask] - self.config.MIN_THRESHOLD) / 
-                        (self.config.MAX_THRESHOLD - self.config.MIN_THRESHOLD))
-        
-        chars = ' ░▒▓█'
-        current_buffer = [[" " for _ in range(self.config.nH)] for _ in range(self.config.nV)]
-
         if not self.frame_initialized:
             # Initialize frame
             TerminalUtils.clear_screen()
             TerminalUtils.hide_cursor()
             
-            # Draw frame
-            TerminalUtils.move_cursor(1, 1)
-            print("┏" + "━" * (self.config.nH * 2) + "┓")
-            for i in range(self.config.nV):
-                TerminalUtils.move_cursor(1, i + 2)
-                print("┃" + " " * (self.config.nH * 2) + "┃")
-            TerminalUtils.move_cursor(1, self.config.nV + 2)
-            print("┗" + "━" * (self.config.nH * 2) + "┛")
+            # Draw frame and static content in a single write
+            width = self.nH * 2
+            parts = ["\033[1;1H┏" + "━" * width + "┓\n"]
+            for i in range(self.nV):
+                parts.append(f"\033[{i + 2};1H┃" + " " * width + "┃\n")
+            parts.append(f"\033[{self.nV + 2};1H┗" + "━" * width + "┛\n")
+            
+            # Static content
+            static_lines = (
+                f"Range: {self.config.MIN_THRESHOLD:.1f}m to {self.config.MAX_THRESHOLD:.1f}m",
+                "Controls:",
+                "  'q' - Exit",
+                "  'w' - Toggle window",
+                "  's' - Toggle stats",
+                "  'm' - Toggle mirror mode",
+            )
+            for row, line in enumerate(static_lines, start=self.nV + 4):
+                parts.append(f"\033[{row};1H{line}\n")
             
-            # Print static content
-            TerminalUtils.move_cursor(1, self.config.nV + 4)
-            print(f"Range: {self.config.MIN_THRESHOLD:.1f}m to {self.config.MAX_THRESHOLD:.1f}m")
-            TerminalUtils.move_cursor(1, self.config.nV + 5)
-            print("Controls:")
-            TerminalUtils.move_cursor(1, self.config.nV + 6)
-            print("  'q' - Exit")
-            TerminalUtils.move_cursor(1, self.config.nV + 7)
-            print("  'w' - Toggle window")
-            TerminalUtils.move_cursor(1, self.config.nV + 8)
-            print("  's' - Toggle stats")
-            TerminalUtils.move_cursor(1, self.config.nV + 9)
-            print("  'm' - Toggle mirror mode")
+            sys.stdout.write("".join(parts))
+            TerminalUtils.flush()
             
             self.frame_initialized = True
+            self._last_console_signature = None
 
-        # Update heatmap
-        for i in range(self.config.nV):
-            for j in range(self.config.nH):
-                if mask[i, j]:
-                    char_idx = int(normalized[i, j] * (len(chars) - 1))
-                    current_char = chars[char_idx]
-                else:
-                    current_char = " "
-                
-                current_buffer[i][j] = current_char
-                
-                if current_char != prev_buffer[i][j]:
-                    TerminalUtils.move_cursor(j * 2 + 2, i + 2)
-                    sys.stdout.write(f"\033[94m{current_char}\033[0m ")
-                    sys.stdout.flush()
+        # Nothing to redraw when the shade map hasn't changed
+        signature = frame.char_idx.tobytes()
+        if signature == self._last_console_signature:
+            return prev_buffer
+        self._last_console_signature = signature
+
+        # Update heatmap, redrawing only the cells that changed
+        current_buffer = self._char_codes[frame.char_idx]
+        ys, xs = np.nonzero(current_buffer != prev_buffer)
         
-        return current_buffer
+        if len(ys):
+            cell_codes = self._cell_codes
+            char_idx = frame.char_idx.tolist()
+            parts = [
+                cell_codes[i][j][char_idx[i][j]]
+                for i, j in zip(ys.tolist(), xs.tolist())
+            ]
+            # Drain pending text output before writing to the underlying byte stream
+            sys.stdout.flush()
+            sys.stdout.buffer.write(b"".join(parts))
+            sys.stdout.buffer.flush()
+        
+        prev_buffer[:] = current_buffer
+        return prev_buffer
 
     def reset_frame(self):
         """Reset frame initialization state"""
-        self.frame_initialized = False
\ No newline at end of file
+        self.frame_initialized = False
+        self._last_console_signature = None
\ No newline at end of file
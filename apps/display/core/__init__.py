@@ -4,10 +4,12 @@ Core functionality modules
 
 from .sdl_app import SDLApp
 from .texture_manager import TextureManager
+from .texture_pool import TexturePool
 from .transition_manager import TransitionManager
 
 __all__ = [
     'SDLApp',
     'TextureManager',
+    'TexturePool',
     'TransitionManager'
 ]
\ No newline at end of file
@@ -38,6 +38,9 @@ class SDLApp:
         if not window:
             raise Exception(sdl2.SDL_GetError())
 
+        # Let SDL merge consecutive draw calls into fewer GPU submissions
+        sdl2.SDL_SetHint(sdl2.SDL_HINT_RENDER_BATCHING, b"1")
+
         renderer = sdl2.SDL_CreateRenderer(
             window, -1,
             sdl2.SDL_RENDERER_ACCELERATED | sdl2.SDL_RENDERER_PRESENTVSYNC
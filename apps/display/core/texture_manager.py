@@ -2,12 +2,37 @@ import os
 import sys
 import ctypes
 import sdl2
+import numpy as np
 from PIL import Image
+from apps.generator.utils.jpeg import get_turbojpeg, TJPF_RGB
 
 class TextureManager:
     def __init__(self, renderer):
         self.renderer = renderer
 
+    def _fit_image(self, image, size, keep_aspect, mode, fill):
+        """Resize image to size, letterboxed when keep_aspect is set"""
+        if not keep_aspect:
+            return image.resize(size, Image.Resampling.LANCZOS)
+
+        img_ratio = image.width / image.height
+        target_ratio = size[0] / size[1]
+
+        if img_ratio > target_ratio:
+            new_width = size[0]
+            new_height = int(size[0] / img_ratio)
+        else:
+            new_height = size[1]
+            new_width = int(size[1] * img_ratio)
+
+        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+        new_img = Image.new(mode, size, fill)
+        paste_x = (size[0] - new_width) // 2
+        paste_y = (size[1] - new_height) // 2
+        new_img.paste(image, (paste_x, paste_y))
+        return new_img
+
     def load_image(self, path, size, keep_aspect=True):
         if not os.path.exists(path):
             print(f"File not found: {path}")
@@ -18,30 +43,11 @@ class TextureManager:
             image = Image.open(path)
             image = image.convert('RGBA' if path.endswith('.png') else 'RGB')
 
-            if keep_aspect:
-                img_ratio = image.width / image.height
-                target_ratio = size[0] / size[1]
-
-                if img_ratio > target_ratio:
-                    new_width = size[0]
-                    new_height = int(size[0] / img_ratio)
-                else:
-                    new_height = size[1]
-                    new_width = int(size[1] * img_ratio)
-
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                new_img = Image.new(
-                    'RGBA' if path.endswith('.png') else 'RGB', 
-                    size, 
-                    (0, 0, 0, 0 if path.endswith('.png') else 255)
-                )
-                paste_x = (size[0] - new_width) // 2
-                paste_y = (size[1] - new_height) // 2
-                new_img.paste(image, (paste_x, paste_y))
-                image = new_img
-            else:
-                image = image.resize(size, Image.Resampling.LANCZOS)
+            image = self._fit_image(
+                image, size, keep_aspect,
+                'RGBA' if path.endswith('.png') else 'RGB', 
+                (0, 0, 0, 0 if path.endswith('.png') else 255)
+            )
 
             # Create SDL surface
             has_alpha = path.endswith('.png')
@@ -98,3 +104,41 @@ class TextureManager:
             sdl2.SDL_SetTextureAlphaMod(texture, 255)
 
         return texture
+
+    def decode_image(self, path, size, keep_aspect=True):
+        """
+        Decode image to an RGB array fitted to size. Uses libjpeg-turbo when
+        available. Makes no SDL calls, so it is safe to run on worker threads.
+        """
+        jpeg = get_turbojpeg()
+        if jpeg is not None and path.endswith('.jpg'):
+            with open(path, 'rb') as f:
+                pixels = jpeg.decode(f.read(), pixel_format=TJPF_RGB)
+            if (pixels.shape[1], pixels.shape[0]) == tuple(size):
+                return pixels
+            image = Image.fromarray(pixels)
+        else:
+            image = Image.open(path).convert('RGB')
+
+        image = self._fit_image(image, size, keep_aspect, 'RGB', (0, 0, 0, 255))
+        return np.asarray(image)
+
+    def create_texture_from_pixels(self, pixels):
+        """Upload a contiguous RGB array into a new static texture"""
+        texture = sdl2.SDL_CreateTexture(
+            self.renderer,
+            sdl2.SDL_PIXELFORMAT_RGB24,
+            sdl2.SDL_TEXTUREACCESS_STATIC,
+            pixels.shape[1],
+            pixels.shape[0]
+        )
+        if not texture:
+            print(f"Failed to create texture: {sdl2.SDL_GetError()}")
+            return None
+
+        if sdl2.SDL_UpdateTexture(texture, None, pixels.ctypes.data, pixels.strides[0]) != 0:
+            print(f"Failed to update texture: {sdl2.SDL_GetError()}")
+            sdl2.SDL_DestroyTexture(texture)
+            return None
+
+        return texture
\ No newline at end of file
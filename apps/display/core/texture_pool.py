@@ -0,0 +1,51 @@
+import ctypes
+import sdl2
+
+class TexturePool:
+    """Reuses SDL textures keyed by (width, height, format, access) instead of recreating them"""
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self._free = {}  # key -> list of released textures
+        self._keys = {}  # texture address -> key, for textures created by this pool
+
+    @staticmethod
+    def _address(texture):
+        return ctypes.addressof(texture.contents)
+
+    def acquire(self, width, height,
+                fmt=sdl2.SDL_PIXELFORMAT_RGBA8888,
+                access=sdl2.SDL_TEXTUREACCESS_TARGET):
+        """Return a free texture of the given shape, creating one on a miss.
+        Reused textures keep their previous contents, blend and alpha mod."""
+        key = (width, height, fmt, access)
+        free = self._free.get(key)
+        if free:
+            return free.pop()
+
+        texture = sdl2.SDL_CreateTexture(self.renderer, fmt, access, width, height)
+        if not texture:
+            print(f"Failed to create texture: {sdl2.SDL_GetError()}")
+            return None
+
+        self._keys[self._address(texture)] = key
+        return texture
+
+    def release(self, texture):
+        """Return texture to the pool; textures not created by the pool are destroyed"""
+        if not texture:
+            return
+
+        key = self._keys.get(self._address(texture))
+        if key is None:
+            sdl2.SDL_DestroyTexture(texture)
+            return
+
+        self._free.setdefault(key, []).append(texture)
+
+    def clear(self):
+        """Destroy all textures currently held in the pool"""
+        for textures in self._free.values():
+            for texture in textures:
+                del self._keys[self._address(texture)]
+                sdl2.SDL_DestroyTexture(texture)
+        self._free.clear()
\ No newline at end of file
@@ -1,11 +1,28 @@
+import ctypes
 import sdl2
+from collections import OrderedDict
+import numpy as np
 from integration.config import IntegratedConfig
+from .texture_pool import TexturePool
 
 class TransitionManager:
     """Handles transitions between different playback states"""
+    # Maximum number of rendered fades kept for reuse (each is num_steps screen-sized textures)
+    FADE_CACHE_SIZE = 4
+
     def __init__(self, renderer, config: IntegratedConfig):
         self.renderer = renderer
         self.config = config
+        self.pool = TexturePool(renderer)
+        self._fade_cache = OrderedDict()  # (image key, overlay key, direction, num_steps) -> frame textures, LRU order
+        self._blend_cache = {}  # pooled texture address -> blend mode last set
+        self._combined_cache = {}  # (image key, overlay key) -> composed texture, most recent pair only
+        self._alpha_cache = {}  # (num_steps, to_white) -> white overlay alphas
+
+        # Fade length only depends on config, so both alpha curves are computed up front
+        num_steps = int(config.fade_duration * 60)
+        self._fade_alphas(num_steps, to_white=True)
+        self._fade_alphas(num_steps, to_white=False)
 
     def ease_exponential_in(self, t):
         return 0 if t == 0 else pow(2, 10 * t - 10)
@@ -13,35 +30,132 @@ class TransitionManager:
     def ease_exponential_out(self, t):
             return 1 if t == 1 else 1 - pow(2, -10 * t)
 
-    def create_fade_from_white(self, image_texture, overlay_texture):
-        """Creates a fade from white effect using exponential out easing"""
-        num_steps = int(self.config.fade_duration * 60)
-        fade_textures = []
-
-        target = sdl2.SDL_CreateTexture(
-            self.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
-            self.config.final_resolution[0],
-            self.config.final_resolution[1]
-        )
-
-        combined = sdl2.SDL_CreateTexture(
-            self.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
-            self.config.final_resolution[0],
-            self.config.final_resolution[1]
-        )
-
-        white = sdl2.SDL_CreateTexture(
-            self.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
+    def _fade_alphas(self, num_steps, to_white):
+        """White overlay alpha (0-255) for every fade step, same easing as ease_exponential_*"""
+        key = (num_steps, to_white)
+        alphas = self._alpha_cache.get(key)
+        if alphas is None:
+            progress = np.linspace(0, 1, num_steps)
+            if to_white:
+                # ease_exponential_in, endpoint masked instead of branching per step
+                eased = np.exp2(10 * progress - 10)
+                eased[:1] = 0
+            else:
+                # 1 - ease_exponential_out
+                eased = np.exp2(-10 * progress)
+                eased[-1:] = 0
+            alphas = (eased * 255).astype(np.uint8).tolist()
+            self._alpha_cache[key] = alphas
+        return alphas
+
+    def _set_blend(self, texture, mode):
+        """Set blend mode on a pooled texture, skipping the call if it is already set"""
+        address = ctypes.addressof(texture.contents)
+        if self._blend_cache.get(address) != mode:
+            sdl2.SDL_SetTextureBlendMode(texture, mode)
+            self._blend_cache[address] = mode
+
+    def _pair_key(self, image_key, overlay_key):
+        """
+        Cache key for an image/overlay pair, None when the caller gave no keys.
+        Texture addresses are not used since SDL hands a freed texture's address
+        to the next one it creates.
+        """
+        if image_key is None or overlay_key is None:
+            return None
+        return (image_key, overlay_key)
+
+    def _get_cached_fade(self, key):
+        """Previously rendered fade frames for key, or None"""
+        if key is None:
+            return None
+        frames = self._fade_cache.get(key)
+        if frames is not None:
+            self._fade_cache.move_to_end(key)
+        return frames
+
+    def _new_fade_frames(self, key, num_steps):
+        """Frame textures for a new fade, cached under key; evicts least recently used fades"""
+        if key is None:
+            # Uncached fade, still tracked so eviction returns its frames to the pool
+            key = object()
+        while len(self._fade_cache) >= self.FADE_CACHE_SIZE:
+            _, evicted = self._fade_cache.popitem(last=False)
+            for frame in evicted:
+                self.pool.release(frame)
+
+        frames = [self.pool.acquire(*self.config.final_resolution) for _ in range(num_steps)]
+        for frame in frames:
+            self._set_blend(frame, sdl2.SDL_BLENDMODE_BLEND)
+        self._fade_cache[key] = frames
+        return frames
+
+    def _image_rect(self):
+        """Destination of the image area on screen"""
+        return sdl2.SDL_Rect(
+            0,
+            self.config.final_resolution_offset,
             self.config.final_resolution_model[0],
             1280
         )
 
+    def _compose_combined(self, image_texture, overlay_texture, key):
+        """Image with black bars and overlay on top (full screen), reused while the pair key is unchanged"""
+        combined = self._combined_cache.get(key) if key is not None else None
+        if combined is not None:
+            return combined
+        self._release_combined()
+        if key is None:
+            key = object()
+
+        combined = self.pool.acquire(*self.config.final_resolution)
+        sdl2.SDL_SetRenderTarget(self.renderer, combined)
+        sdl2.SDL_SetRenderDrawColor(self.renderer, 0, 0, 0, 255)
+        sdl2.SDL_RenderClear(self.renderer)
+
+        # Render image with black bars
+        sdl2.SDL_RenderCopy(self.renderer, image_texture, None, self._image_rect())
+
+        # Apply overlay with blending
+        sdl2.SDL_SetTextureBlendMode(overlay_texture, sdl2.SDL_BLENDMODE_BLEND)
+        sdl2.SDL_RenderCopy(self.renderer, overlay_texture, None, None)
+        self._set_blend(combined, sdl2.SDL_BLENDMODE_BLEND)
+
+        self._combined_cache[key] = combined
+        return combined
+
+    def _release_combined(self):
+        for combined in self._combined_cache.values():
+            self.pool.release(combined)
+        self._combined_cache.clear()
+
+    def release_fade_frames(self):
+        """Return all cached fade frames to the pool. Call when the file behind an image or overlay key changes."""
+        for frames in self._fade_cache.values():
+            for frame in frames:
+                self.pool.release(frame)
+        self._fade_cache.clear()
+        self._release_combined()
+
+    def cleanup(self):
+        """Destroy all fade frames and pooled textures"""
+        self.release_fade_frames()
+        self.pool.clear()
+        self._blend_cache.clear()
+
+    def create_fade_from_white(self, image_texture, overlay_texture, image_key=None, overlay_key=None):
+        """Creates a fade from white effect using exponential out easing.
+        Returned textures are owned by the manager. Fades are reused when image_key and overlay_key
+        (e.g. the source file paths) match an earlier call; without keys every call renders anew."""
+        num_steps = int(self.config.fade_duration * 60)
+        pair_key = self._pair_key(image_key, overlay_key)
+        key = pair_key + ('from_white', num_steps) if pair_key is not None else None
+        cached = self._get_cached_fade(key)
+        if cached is not None:
+            return cached
+
+        white = self.pool.acquire(self.config.final_resolution_model[0], 1280)
+
         # Prepare white texture with black bars
         sdl2.SDL_SetRenderTarget(self.renderer, white)
         sdl2.SDL_SetRenderDrawColor(self.renderer, 0, 0, 0, 255)
@@ -50,93 +164,43 @@ class TransitionManager:
         sdl2.SDL_SetRenderDrawColor(self.renderer, 255, 255, 255, 255)
         white_rect = sdl2.SDL_Rect(0, 40, self.config.final_resolution_model[0], 1200)
         sdl2.SDL_RenderFillRect(self.renderer, white_rect)
-        sdl2.SDL_SetRenderTarget(self.renderer, None)
+        self._set_blend(white, sdl2.SDL_BLENDMODE_BLEND)
 
         # Prepare combined texture
-        sdl2.SDL_SetRenderTarget(self.renderer, combined)
-        sdl2.SDL_SetRenderDrawColor(self.renderer, 0, 0, 0, 255)
-        sdl2.SDL_RenderClear(self.renderer)
-
-        dest_rect = sdl2.SDL_Rect(
-            0, 
-            self.config.final_resolution_offset,
-            self.config.final_resolution_model[0],
-            1280
-        )
-
-        sdl2.SDL_RenderCopy(self.renderer, image_texture, None, dest_rect)
-        sdl2.SDL_SetTextureBlendMode(overlay_texture, sdl2.SDL_BLENDMODE_BLEND)
-        sdl2.SDL_RenderCopy(self.renderer, overlay_texture, None, None)
-        sdl2.SDL_SetRenderTarget(self.renderer, None)
-        sdl2.SDL_SetTextureBlendMode(combined, sdl2.SDL_BLENDMODE_BLEND)
+        combined = self._compose_combined(image_texture, overlay_texture, pair_key)
+        dest_rect = self._image_rect()
 
         # Generate fade frames with exponential out easing
-        for i in range(num_steps):
-            progress = i / (num_steps - 1)
-            eased_progress = self.ease_exponential_out(progress)
-
-            sdl2.SDL_SetRenderTarget(self.renderer, target)
+        fade_textures = self._new_fade_frames(key, num_steps)
+        for frame, alpha in zip(fade_textures, self._fade_alphas(num_steps, to_white=False)):
+            sdl2.SDL_SetRenderTarget(self.renderer, frame)
             sdl2.SDL_RenderClear(self.renderer)
 
             # Render combined image
             sdl2.SDL_RenderCopy(self.renderer, combined, None, None)
 
             # Apply white transition with inverse alpha
-            sdl2.SDL_SetTextureBlendMode(white, sdl2.SDL_BLENDMODE_BLEND)
-            sdl2.SDL_SetTextureAlphaMod(white, int((1 - eased_progress) * 255))
+            sdl2.SDL_SetTextureAlphaMod(white, alpha)
             sdl2.SDL_RenderCopy(self.renderer, white, None, dest_rect)
 
-            frame = sdl2.SDL_CreateTexture(
-                self.renderer,
-                sdl2.SDL_PIXELFORMAT_RGBA8888,
-                sdl2.SDL_TEXTUREACCESS_TARGET,
-                self.config.final_resolution[0],
-                self.config.final_resolution[1]
-            )
-
-            sdl2.SDL_SetTextureBlendMode(frame, sdl2.SDL_BLENDMODE_BLEND)
-            sdl2.SDL_SetRenderTarget(self.renderer, frame)
-            sdl2.SDL_RenderCopy(self.renderer, target, None, None)
-            fade_textures.append(frame)
-
         sdl2.SDL_SetRenderTarget(self.renderer, None)
-        sdl2.SDL_DestroyTexture(target)
-        sdl2.SDL_DestroyTexture(combined)
-        sdl2.SDL_DestroyTexture(white)
+        self.pool.release(white)
 
         return fade_textures
 
-    def create_fade_to_white(self, image_texture, overlay_texture):
-        """Creates a fade to white effect over the specified duration"""
+    def create_fade_to_white(self, image_texture, overlay_texture, image_key=None, overlay_key=None):
+        """Creates a fade to white effect over the specified duration.
+        Returned textures are owned by the manager. Fades are reused when image_key and overlay_key
+        (e.g. the source file paths) match an earlier call; without keys every call renders anew."""
         num_steps = int(self.config.fade_duration * 60)
-        fade_textures = []
-
-        # Create target texture for full screen
-        target = sdl2.SDL_CreateTexture(
-            self.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
-            self.config.final_resolution[0],
-            self.config.final_resolution[1]
-        )
-
-        # Create texture for combined image and overlay (full screen)
-        combined = sdl2.SDL_CreateTexture(
-            self.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
-            self.config.final_resolution[0],
-            self.config.final_resolution[1]
-        )
+        pair_key = self._pair_key(image_key, overlay_key)
+        key = pair_key + ('to_white', num_steps) if pair_key is not None else None
+        cached = self._get_cached_fade(key)
+        if cached is not None:
+            return cached
 
         # Create white texture for image area (3840x1280)
-        white = sdl2.SDL_CreateTexture(
-            self.renderer,
-            sdl2.SDL_PIXELFORMAT_RGBA8888,
-            sdl2.SDL_TEXTUREACCESS_TARGET,
-            self.config.final_resolution_model[0],
-            1280
-        )
+        white = self.pool.acquire(self.config.final_resolution_model[0], 1280)
 
         # Prepare white texture with black bars
         sdl2.SDL_SetRenderTarget(self.renderer, white)
@@ -147,73 +211,37 @@ class TransitionManager:
         sdl2.SDL_SetRenderDrawColor(self.renderer, 255, 255, 255, 255)
         white_rect = sdl2.SDL_Rect(0, 40, self.config.final_resolution_model[0], 1200)
         sdl2.SDL_RenderFillRect(self.renderer, white_rect)
-        sdl2.SDL_SetRenderTarget(self.renderer, None)
+        self._set_blend(white, sdl2.SDL_BLENDMODE_BLEND)
 
         # Prepare combined texture with image and overlay
-        sdl2.SDL_SetRenderTarget(self.renderer, combined)
-        sdl2.SDL_SetRenderDrawColor(self.renderer, 0, 0, 0, 255)
-        sdl2.SDL_RenderClear(self.renderer)
-
-        dest_rect = sdl2.SDL_Rect(
-            0, 
-            self.config.final_resolution_offset,
-            self.config.final_resolution_model[0],
-            1280
-        )
-
-        # Render image with black bars
-        sdl2.SDL_RenderCopy(self.renderer, image_texture, None, dest_rect)
-
-        # Apply overlay with blending
-        sdl2.SDL_SetTextureBlendMode(overlay_texture, sdl2.SDL_BLENDMODE_BLEND)
-        sdl2.SDL_RenderCopy(self.renderer, overlay_texture, None, None)
-        sdl2.SDL_SetRenderTarget(self.renderer, None)
-        sdl2.SDL_SetTextureBlendMode(combined, sdl2.SDL_BLENDMODE_BLEND)
+        combined = self._compose_combined(image_texture, overlay_texture, pair_key)
+        dest_rect = self._image_rect()
 
         # Generate fade frames
-        for i in range(num_steps):
-            progress = i / (num_steps - 1)
-            eased_progress = self.ease_exponential_in(progress)
-
+        fade_textures = self._new_fade_frames(key, num_steps)
+        for frame, alpha in zip(fade_textures, self._fade_alphas(num_steps, to_white=True)):
             # Set target and clear
-            sdl2.SDL_SetRenderTarget(self.renderer, target)
+            sdl2.SDL_SetRenderTarget(self.renderer, frame)
             sdl2.SDL_RenderClear(self.renderer)
 
             # Render combined image
             sdl2.SDL_RenderCopy(self.renderer, combined, None, None)
 
             # Apply white transition only to image area
-            sdl2.SDL_SetTextureBlendMode(white, sdl2.SDL_BLENDMODE_BLEND)
-            sdl2.SDL_SetTextureAlphaMod(white, int(eased_progress * 255))
+            sdl2.SDL_SetTextureAlphaMod(white, alpha)
             sdl2.SDL_RenderCopy(self.renderer, white, None, dest_rect)
 
-            # Create texture for this frame
-            frame = sdl2.SDL_CreateTexture(
-                self.renderer,
-                sdl2.SDL_PIXELFORMAT_RGBA8888,
-                sdl2.SDL_TEXTUREACCESS_TARGET,
-                self.config.final_resolution[0],
-                self.config.final_resolution[1]
-            )
-
-            sdl2.SDL_SetTextureBlendMode(frame, sdl2.SDL_BLENDMODE_BLEND)
-
-            # Copy frame
-            sdl2.SDL_SetRenderTarget(self.renderer, frame)
-            sdl2.SDL_RenderCopy(self.renderer, target, None, None)
-
-            fade_textures.append(frame)
-
         # Cleanup
         sdl2.SDL_SetRenderTarget(self.renderer, None)
-        sdl2.SDL_DestroyTexture(target)
-        sdl2.SDL_DestroyTexture(combined)
-        sdl2.SDL_DestroyTexture(white)
+        self.pool.release(white)
 
         return fade_textures
 
     def create_white_transition_texture(self):
         """Creates a white texture with black bars for transition"""
+        # A transition means a new image/overlay pair, the composed previous pair won't be reused
+        self._release_combined()
+
         white_transition = sdl2.SDL_CreateTexture(
             self.renderer,
             sdl2.SDL_PIXELFORMAT_RGBA8888,
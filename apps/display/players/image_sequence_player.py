@@ -2,98 +2,115 @@ import os
 import time
 import sdl2
 import numpy as np
-from threading import Thread, Lock
-from queue import Queue
-from PIL import Image
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
 from integration.config import IntegratedConfig
+from ..core.texture_pool import TexturePool
+from .ring import TextureRing
 
 class ImageSequencePlayer:
     """Handles image sequence playback with interpolation"""
+    # Number of upcoming frames decoded ahead of display
+    DECODE_AHEAD = 4
+
     def __init__(self, config: IntegratedConfig, texture_manager):
         self.config = config
         self.texture_manager = texture_manager
-        self.frame_buffer = Queue(maxsize=config.buffer_size)
-        self.interpolation_buffer = Queue(maxsize=config.frames_to_interpolate)
-        self.buffer_lock = Lock()
+        self.frame_buffer = TextureRing(config.buffer_size)
+        self.interpolation_buffer = TextureRing(config.frames_to_interpolate)
+        self._loader_generation = 0  # bumped to retire the running loader thread
+        self._loader_thread = None
+        self._listing = (None, set())  # (directory, file names) seen by the loader
+        self._directory_version = 0  # bumped by set_directory to drop pending decodes
         self.current_directory = None
+        self._path_template = None  # str.format template of frame paths in current_directory
+        
+        # JPEG decoding runs on worker threads, SDL uploads stay on the loader thread
+        self._decoder = ThreadPoolExecutor(max_workers=2, thread_name_prefix="frame-decoder")
         
         # Interpolation state
         self.current_frame_texture = None
         self.next_frame_texture = None
-        self.current_frame_data = None
-        self.next_frame_data = None
         self.interpolation_index = 0
+        
+        # Blend alpha (0-255) of the next frame for each interpolant, fixed for the player's lifetime
+        steps = config.frames_to_interpolate
+        self._alpha_u8 = np.round(np.arange(1, steps + 1) * 255 / (steps + 1)).astype(np.uint8).tolist()
+        
+        # Interpolated frames are rendered on the GPU into pooled target textures
+        self.pool = TexturePool(texture_manager.renderer)
+        self._displayed_interpolant = None
 
-    def _interpolate_frames(self, frame1_data, frame2_data, alpha):
+    def _interpolate_frames(self, frame1_texture, frame2_texture, alpha_u8):
         """
-        Interpolate between two frames using linear interpolation
+        Interpolate between two frames using linear interpolation on the GPU
         
         Args:
-            frame1_data: NumPy array of first frame
-            frame2_data: NumPy array of second frame
-            alpha: Interpolation factor (0.0 - 1.0)
+            frame1_texture: SDL texture of first frame
+            frame2_texture: SDL texture of second frame
+            alpha_u8: Interpolation factor scaled to 0 - 255
             
         Returns:
-            Interpolated frame as SDL texture
+            Interpolated frame as SDL texture (owned by the player's pool)
         """
-        # Linear interpolation between frames
-        interpolated = frame1_data * (1 - alpha) + frame2_data * alpha
-        interpolated = interpolated.astype(np.uint8)
+        renderer = self.texture_manager.renderer
+        width, height = self.config.final_resolution_model
+        texture = self.pool.acquire(width, height)
+        if not texture:
+            return None
         
-        # Create PIL image from array
-        img = Image.fromarray(interpolated)
+        # Opaque copy of the first frame, second frame alpha-blended on top
+        sdl2.SDL_SetRenderTarget(renderer, texture)
+        sdl2.SDL_SetTextureBlendMode(frame1_texture, sdl2.SDL_BLENDMODE_NONE)
+        sdl2.SDL_RenderCopy(renderer, frame1_texture, None, None)
         
-        # Convert to SDL texture
-        surface = sdl2.SDL_CreateRGBSurfaceFrom(
-            interpolated.ctypes.data,
-            interpolated.shape[1],
-            interpolated.shape[0],
-            32,
-            interpolated.shape[1] * 4,
-            0xFF000000,
-            0x00FF0000,
-            0x0000FF00,
-            0x000000FF
-        )
+        sdl2.SDL_SetTextureBlendMode(frame2_texture, sdl2.SDL_BLENDMODE_BLEND)
+        sdl2.SDL_SetTextureAlphaMod(frame2_texture, alpha_u8)
+        sdl2.SDL_RenderCopy(renderer, frame2_texture, None, None)
+        sdl2.SDL_SetRenderTarget(renderer, None)
         
-        if not surface:
-            return None
-            
-        texture = self.texture_manager.create_texture_from_surface(surface)
-        sdl2.SDL_FreeSurface(surface)
+        # Restore defaults of JPEG-loaded textures before second frame is displayed
+        sdl2.SDL_SetTextureAlphaMod(frame2_texture, 255)
+        sdl2.SDL_SetTextureBlendMode(frame2_texture, sdl2.SDL_BLENDMODE_NONE)
         
         return texture
 
     def _generate_interpolation_frames(self):
         """Generate interpolation frames between current and next frame"""
-        if not self.current_frame_data is None and not self.next_frame_data is None:
+        if self.current_frame_texture and self.next_frame_texture:
             # Clear existing interpolation buffer
-            while not self.interpolation_buffer.empty():
-                old_texture = self.interpolation_buffer.get()
-                sdl2.SDL_DestroyTexture(old_texture)
+            for old_texture in self.interpolation_buffer.drain():
+                self.pool.release(old_texture)
                 
             # Generate new interpolation frames
-            for i in range(self.config.frames_to_interpolate):
-                alpha = (i + 1) / (self.config.frames_to_interpolate + 1)
+            for alpha_u8 in self._alpha_u8:
                 texture = self._interpolate_frames(
-                    self.current_frame_data,
-                    self.next_frame_data,
-                    alpha
+                    self.current_frame_texture,
+                    self.next_frame_texture,
+                    alpha_u8
                 )
                 if texture:
-                    self.interpolation_buffer.put(texture)
+                    self.interpolation_buffer.try_put(texture)
 
     def get_next_display_frame(self):
         """
         Get next frame to display, either interpolated or source frame
         
         Returns:
-            SDL texture of next frame to display
+            SDL texture of next frame to display, valid until the next call
         """
+        # Interpolated frame handed out by the previous call goes back to the pool
+        if self._displayed_interpolant:
+            self.pool.release(self._displayed_interpolant)
+            self._displayed_interpolant = None
+        
         # If we have interpolated frames, return the next one
-        if not self.interpolation_buffer.empty():
+        texture = self.interpolation_buffer.try_get()
+        if texture is not None:
             self.interpolation_index += 1
-            return self.interpolation_buffer.get()
+            self._displayed_interpolant = texture
+            return texture
             
         # If we need to load new source frames
         if self.current_frame_texture is None or self.interpolation_index >= self.config.frames_to_interpolate:
@@ -102,42 +119,11 @@ class ImageSequencePlayer:
                 sdl2.SDL_DestroyTexture(self.current_frame_texture)
             
             self.current_frame_texture = self.next_frame_texture
-            self.current_frame_data = self.next_frame_data
             
             # Get next frame from buffer
-            if not self.frame_buffer.empty():
-                _, self.next_frame_texture = self.frame_buffer.get()
-                
-                # Convert texture to array for interpolation
-                surface = sdl2.SDL_CreateRGBSurface(
-                    0,
-                    self.config.final_resolution_model[0],
-                    self.config.final_resolution_model[1],
-                    32,
-                    0xFF000000,
-                    0x00FF0000,
-                    0x0000FF00,
-                    0x000000FF
-                )
-                
-                sdl2.SDL_RenderReadPixels(
-                    self.texture_manager.renderer,
-                    None,
-                    sdl2.SDL_PIXELFORMAT_RGBA8888,
-                    surface.contents.pixels,
-                    surface.contents.pitch
-                )
-                
-                self.next_frame_data = np.frombuffer(
-                    surface.contents.pixels, 
-                    dtype=np.uint8
-                ).reshape(
-                    self.config.final_resolution_model[1],
-                    self.config.final_resolution_model[0],
-                    4
-                )
-                
-                sdl2.SDL_FreeSurface(surface)
+            item = self.take_frame()
+            if item is not None:
+                _, self.next_frame_texture = item
                 
                 # Generate new interpolation frames
                 self._generate_interpolation_frames()
@@ -145,86 +131,167 @@ class ImageSequencePlayer:
             
         return self.current_frame_texture
 
+    def take_frame(self):
+        """
+        Pop the oldest buffered source frame of the current directory (consumer side).
+        Frames put by the loader for an older directory version are destroyed.
+        
+        Returns:
+            (index, texture) or None if no current frame is buffered
+        """
+        while True:
+            item = self.frame_buffer.try_get()
+            if item is None:
+                return None
+            version, index, texture = item
+            if version == self._directory_version:
+                return index, texture
+            sdl2.SDL_DestroyTexture(texture)
+
     def start_loader_thread(self, start_index):
-        """Start background thread for loading source frames"""
+        """Start background thread for loading source frames, replacing any running one"""
+        self._loader_generation += 1
         loader_thread = Thread(
             target=self._buffer_loader_thread,
-            args=(start_index,),
+            args=(start_index, self._loader_generation, self._loader_thread),
             daemon=True
         )
+        self._loader_thread = loader_thread
         loader_thread.start()
 
-    def _buffer_loader_thread(self, start_index):
-        """Background thread for loading source frames"""
-        current_index = start_index
-        frame_interval = 1.0 / self.config.source_fps
+    def _buffer_loader_thread(self, start_index, generation, retired_loader=None):
+        """Background thread for loading source frames (the ring's only producer)"""
+        # The retired loader may still be finishing a frame; wait for it so the
+        # ring never has two producers (joined here, not on the display thread)
+        if retired_loader is not None:
+            retired_loader.join()
+
+        current_index = start_index  # next frame to enqueue
+        submit_index = start_index  # next frame to hand to the decoder
+        pending = deque()  # (index, future) of frames being decoded, in order
+        directory_version = self._directory_version
         last_frame_time = time.time()
 
-        while True:
-            current_time = time.time()
-            if current_time - last_frame_time >= frame_interval:
-                if self.frame_buffer.full():
-                    time.sleep(frame_interval * 0.1)
-                    continue
-
-                current_seq = self.config.get_current_sequence()
-                if not current_seq or not self.current_directory:
-                    time.sleep(0.1)
-                    continue
-                
-                image_path = os.path.join(
-                    str(self.current_directory),
-                    f"{current_index:09d}.jpg"
-                )
+        # Loop-invariant lookups bound once
+        config = self.config
+        frame_interval = 1.0 / config.source_fps
+        frame_step = config.frame_step
+        model_resolution = config.final_resolution_model
+        frame_buffer = self.frame_buffer
+        submit_decode = self._decoder.submit
+        decode_image = self.texture_manager.decode_image
+        create_texture = self.texture_manager.create_texture_from_pixels
+        frame_exists = self._frame_exists
+        decode_ahead = self.DECODE_AHEAD
 
-                #self.logger.log(f"--- Looking for file: {image_path}")
-                if not os.path.exists(image_path):
-                    time.sleep(0.1)
-                    continue
+        while generation == self._loader_generation:
+            # Block until the consumer frees a slot instead of polling
+            if frame_buffer.full():
+                frame_buffer.wait_not_full(timeout=frame_interval)
+                continue
 
-                texture = self.texture_manager.load_image(
-                    image_path, 
-                    self.config.final_resolution_model, 
-                    keep_aspect=True
-                )
+            # Version is read before the directory, a change in between is caught next iteration
+            version = self._directory_version
+            current_seq = config.get_current_sequence()
+            directory = self.current_directory
+            path_template = self._path_template
+            if not current_seq or not directory or path_template is None:
+                time.sleep(0.1)
+                continue
+            directory = str(directory)
 
-                if texture:
-                    self.frame_buffer.put((current_index, texture))
-                    current_index += self.config.frame_step
-                    last_frame_time = current_time
-                else:
-                    time.sleep(0.1)
+            # Directory changed - frames decoded so far are stale
+            if directory_version != version:
+                directory_version = version
+                pending.clear()
+                submit_index = current_index
 
-                # Adaptive sleep based on buffer fill level
-                buffer_fill = self.frame_buffer.qsize() / self.config.buffer_size
-                sleep_time = frame_interval * (0.1 if buffer_fill > 0.8 else 0.5)
-                time.sleep(sleep_time)
+            # Decode ahead the upcoming frames that are already on disk
+            while len(pending) < decode_ahead:
+                if not frame_exists(directory, f"{submit_index:09d}.jpg"):
+                    break
+                future = submit_decode(decode_image, path_template.format(submit_index), model_resolution, True)
+                pending.append((submit_index, future))
+                submit_index += frame_step
 
-            time.sleep(0.001)
+            if not pending:
+                time.sleep(0.1)
+                continue
 
-    def set_directory(self, new_directory):
-        """Change the source directory and clear buffers"""
-        with self.buffer_lock:
-            # Clear existing buffers
-            while not self.frame_buffer.empty():
-                _, texture = self.frame_buffer.get()
-                sdl2.SDL_DestroyTexture(texture)
-                
-            while not self.interpolation_buffer.empty():
-                texture = self.interpolation_buffer.get()
+            # Sleep until the next frame is due
+            wait_time = frame_interval - (time.time() - last_frame_time)
+            if wait_time > 0:
+                time.sleep(wait_time)
+                continue
+
+            index, future = pending.popleft()
+            try:
+                texture = create_texture(future.result())
+            except Exception as e:
+                print(f"Error loading frame {index}: {e}")
+                texture = None
+
+            if texture and directory_version != self._directory_version:
+                # set_directory ran during the upload, frame belongs to the old directory
                 sdl2.SDL_DestroyTexture(texture)
+            elif texture:
+                # Tagged with its version: set_directory may still run between the check
+                # above and this put, the consumer then drops the frame in take_frame
+                frame_buffer.try_put((directory_version, index, texture))
+                current_index = index + frame_step
+                last_frame_time = time.time()
+            else:
+                # Listing may be stale (file removed since the scan), retry this frame
+                self._listing = (None, set())
+                pending.clear()
+                submit_index = current_index
+                time.sleep(0.1)
+
+    def _frame_exists(self, directory, filename):
+        """Check for a frame file against a cached directory listing, rescanning on a miss"""
+        listed_directory, names = self._listing
+        if listed_directory == directory and filename in names:
+            return True
+
+        try:
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+        except FileNotFoundError:
+            names = set()
+        self._listing = (directory, names)
+        return filename in names
+
+    def set_directory(self, new_directory):
+        """
+        Change the source directory and clear buffers.
+        Runs on the consumer (display) thread; the loader is never locked out but
+        notices the change through _directory_version and drops frames of the old directory.
+        A frame put concurrently with the drain below is discarded by take_frame.
+        """
+        # Update directory first so frames put by the loader from now on are recognised as stale,
+        # frame paths are formatted from a template built once here
+        self._listing = (None, set())
+        if new_directory is None:
+            self._path_template = None
+        else:
+            directory = os.fspath(new_directory).replace("{", "{{").replace("}", "}}")
+            self._path_template = os.path.join(directory, "{:09d}.jpg")
+        self.current_directory = new_directory
+        self._directory_version += 1
+
+        # Clear existing buffers
+        for _, _, texture in self.frame_buffer.drain():
+            sdl2.SDL_DestroyTexture(texture)
             
-            # Reset interpolation state
-            if self.current_frame_texture:
-                sdl2.SDL_DestroyTexture(self.current_frame_texture)
-            if self.next_frame_texture:
-                sdl2.SDL_DestroyTexture(self.next_frame_texture)
-                
-            self.current_frame_texture = None
-            self.next_frame_texture = None
-            self.current_frame_data = None
-            self.next_frame_data = None
-            self.interpolation_index = 0
-
-            # Update directory
-            self.current_directory = new_directory
\ No newline at end of file
+        for texture in self.interpolation_buffer.drain():
+            self.pool.release(texture)
+        
+        # Reset interpolation state
+        if self.current_frame_texture:
+            sdl2.SDL_DestroyTexture(self.current_frame_texture)
+        if self.next_frame_texture:
+            sdl2.SDL_DestroyTexture(self.next_frame_texture)
+            
+        self.current_frame_texture = None
+        self.next_frame_texture = None
+        self.interpolation_index = 0
\ No newline at end of file
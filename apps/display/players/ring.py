@@ -0,0 +1,73 @@
+import threading
+
+class TextureRing:
+    """
+    Fixed-capacity single-producer / single-consumer ring buffer.
+    Only the producer advances the tail and only the consumer advances the head,
+    so put/get need no lock (plain int stores are atomic under the GIL).
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._slots = capacity + 1  # one slot stays empty to tell full from empty
+        self._items = [None] * self._slots
+        self._head = 0
+        self._tail = 0
+        
+        # Set whenever the consumer frees a slot, for producers waiting on a full ring
+        self.not_full = threading.Event()
+        self.not_full.set()
+
+    def try_put(self, item) -> bool:
+        """Append item, returns False if the ring is full (producer side)"""
+        tail = self._tail
+        next_tail = (tail + 1) % self._slots
+        if next_tail == self._head:
+            self.not_full.clear()
+            # Consumer may have freed a slot between the check and the clear
+            if next_tail == self._head:
+                return False
+            self.not_full.set()
+        
+        self._items[tail] = item
+        self._tail = next_tail
+        return True
+
+    def wait_not_full(self, timeout=None) -> bool:
+        """Block while the ring is full, up to timeout seconds (producer side)"""
+        if not self.full():
+            return True
+        self.not_full.clear()
+        # Consumer may have freed a slot between the check and the clear
+        if not self.full():
+            self.not_full.set()
+            return True
+        return self.not_full.wait(timeout)
+
+    def try_get(self):
+        """Pop oldest item, returns None if the ring is empty (consumer side)"""
+        head = self._head
+        if head == self._tail:
+            return None
+        
+        item = self._items[head]
+        self._items[head] = None
+        self._head = (head + 1) % self._slots
+        self.not_full.set()
+        return item
+
+    def drain(self):
+        """Pop and yield all items currently in the ring (consumer side)"""
+        while True:
+            item = self.try_get()
+            if item is None:
+                return
+            yield item
+
+    def empty(self) -> bool:
+        return self._head == self._tail
+
+    def full(self) -> bool:
+        return (self._tail + 1) % self._slots == self._head
+
+    def qsize(self) -> int:
+        return (self._tail - self._head) % self._slots
\ No newline at end of file
@@ -4,12 +4,18 @@ from ..core.texture_manager import TextureManager
 
 class VideoPlayer:
     """Handles video playback"""
+    # Streaming textures cycled through for decoded frames
+    STREAM_TEXTURE_COUNT = 2
+
     def __init__(self, video_path, renderer, texture_manager=None):
         self.video_path = video_path
         self.renderer = renderer
         self.texture_manager = texture_manager or TextureManager(renderer)
         self.texture = None
         self.video_finished = False
+        self._stream_textures = []
+        self._stream_size = None
+        self._stream_index = 0
         self._init_video()
 
     def _init_video(self):
@@ -22,28 +28,47 @@ class VideoPlayer:
             print(f"Error initializing video player: {e}")
             raise
 
+    def _next_stream_texture(self, width, height):
+        """Next streaming texture from the ring, recreated when the frame size changes"""
+        if self._stream_size != (width, height):
+            self.cleanup()
+            for _ in range(self.STREAM_TEXTURE_COUNT):
+                texture = sdl2.SDL_CreateTexture(
+                    self.renderer,
+                    sdl2.SDL_PIXELFORMAT_RGBA32,
+                    sdl2.SDL_TEXTUREACCESS_STREAMING,
+                    width,
+                    height
+                )
+                if not texture:
+                    print(f"Failed to create streaming texture: {sdl2.SDL_GetError()}")
+                    self.cleanup()
+                    return None
+                sdl2.SDL_SetTextureBlendMode(texture, sdl2.SDL_BLENDMODE_BLEND)
+                self._stream_textures.append(texture)
+            self._stream_size = (width, height)
+
+        texture = self._stream_textures[self._stream_index]
+        self._stream_index = (self._stream_index + 1) % len(self._stream_textures)
+        return texture
+
     def get_next_frame_texture(self):
+        """
+        Decode next frame and upload it into a reused streaming texture.
+        The texture is owned by the player and stays valid for the next
+        STREAM_TEXTURE_COUNT - 1 calls.
+        """
         try:
             frame = next(self.frame_iterator)
             img = frame.to_ndarray(format='rgba')
 
-            surface = sdl2.SDL_CreateRGBSurfaceFrom(
-                img.ctypes.data, 
-                frame.width, 
-                frame.height, 
-                32, 
-                frame.width * 4,
-                0x000000FF, 
-                0x0000FF00, 
-                0x00FF0000, 
-                0xFF000000
-            )
-
-            if not surface:
+            texture = self._next_stream_texture(frame.width, frame.height)
+            if not texture:
                 return None
 
-            texture = self.texture_manager.create_texture_from_surface(surface)
-            sdl2.SDL_FreeSurface(surface)
+            if sdl2.SDL_UpdateTexture(texture, None, img.ctypes.data, frame.width * 4) != 0:
+                print(f"Failed to update texture: {sdl2.SDL_GetError()}")
+                return None
             return texture
 
         except StopIteration:
@@ -51,4 +76,12 @@ class VideoPlayer:
             return None
         except Exception as e:
             print(f"Error in get_next_frame_texture: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def cleanup(self):
+        """Destroy streaming textures"""
+        for texture in self._stream_textures:
+            sdl2.SDL_DestroyTexture(texture)
+        self._stream_textures = []
+        self._stream_size = None
+        self._stream_index = 0
\ No newline at end of file
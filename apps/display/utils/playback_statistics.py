@@ -9,22 +9,27 @@ class PlaybackStatistics:
         self.displayed_frames = 0
         self.playing = False
 
+    _STATS_FORMAT = (
+        "{:02d}:{:02d}:{:05.2f} | "
+        "Source frames: {} ({:.1f}/s) | "
+        "Total frames: {} ({:.1f}/s)"
+    ).format
+
     def format_stats(self):
         """Format current playback statistics as a string"""
         if self.start_time == 0:
             return "00:00:00.00 | Source frames: 0 (0.0/s) | Total frames: 0 (0.0/s)"
         
-        elapsed = time.time() - self.start_time
-        hours, remainder = divmod(elapsed, 3600)
-        minutes, seconds = divmod(remainder, 60)
-
-        source_fps = self.source_frames / max(elapsed, 0.001)
-        display_fps = self.displayed_frames / max(elapsed, 0.001)
+        # Elapsed time in whole milliseconds, split with integer math
+        total_ms = int((time.time() - self.start_time) * 1000)
+        hours, remainder_ms = divmod(total_ms, 3_600_000)
+        minutes, seconds_ms = divmod(remainder_ms, 60_000)
+        per_second = 1000 / max(total_ms, 1)
 
-        return (
-            f"{int(hours):02}:{int(minutes):02}:{seconds:05.2f} | "
-            f"Source frames: {self.source_frames} ({source_fps:.1f}/s) | "
-            f"Total frames: {self.displayed_frames} ({display_fps:.1f}/s)"
+        return self._STATS_FORMAT(
+            hours, minutes, seconds_ms / 1000,
+            self.source_frames, self.source_frames * per_second,
+            self.displayed_frames, self.displayed_frames * per_second
         )
 
     def update_source_frame(self):
@@ -6,4 +6,5 @@ class MaskConfig:
     """Configuration for a specific mask type"""
     name: str
     gray_values: List[int]
-    gray_indexes: Dict[int, int]
\ No newline at end of file
+    gray_indexes: Dict[int, int]
+    working_scale: int = 1  # Masks are composited at 1/working_scale resolution, result upscaled when saved
\ No newline at end of file
@@ -0,0 +1,83 @@
+import threading
+from itertools import groupby
+from operator import itemgetter
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _composite_layers(final, words, rows, indices):
+    """
+    Single pass over the output image applying the bit-packed mask layers words[rows]:
+    every pixel takes the index of the last layer set there, or keeps its value.
+    Word w of a layer holds pixels 64w - 64w+63 of final as 8 packbits bytes (little endian).
+    Layers are walked from the top, so each pixel is written at most once and a word
+    stops as soon as all of its pixels are covered.
+    """
+    full = ~np.uint64(0)
+    for w in prange(words.shape[1]):
+        seen = np.uint64(0)
+        base = w * 64
+        for k in range(rows.shape[0] - 1, -1, -1):
+            new = words[rows[k], w] & ~seen
+            if not new:
+                continue
+            seen |= new
+            index = indices[k]
+
+            # Solid runs are common in masks, write them without testing bits
+            if new == full:
+                final[base:base + 64] = index
+                break
+            for j in range(8):
+                byte = (new >> np.uint64(8 * j)) & np.uint64(0xFF)
+                start = base + 8 * j
+                if byte == 0xFF:
+                    final[start:start + 8] = index
+                elif byte:
+                    for b in range(8):
+                        if byte & np.uint64(128 >> b):
+                            final[start + b] = index
+            if seen == full:
+                break
+
+
+def _composite_layers_numpy(final, stack, rows, indices):
+    """NumPy fallback for composite_layers when numba is not installed."""
+    height, width = final.shape
+    # Consecutive layers with the same index are OR-ed while still packed, unpacked once
+    for index, group in groupby(zip(rows, indices), key=itemgetter(1)):
+        packed = np.bitwise_or.reduce(stack[[row for row, _ in group]]).reshape(height, -1)
+        np.putmask(final, np.unpackbits(packed, axis=-1, count=width), index)
+
+
+if njit is not None:
+    _composite_layers_jit = njit(parallel=True, cache=True)(_composite_layers)
+
+    # The kernel already uses every core, and numba's default workqueue threading
+    # layer must not be entered from several threads at once
+    _composite_lock = threading.Lock()
+
+    def composite_layers(final, stack, rows, indices):
+        """
+        Write indices[k] into final wherever layer stack[rows[k]] is set, later layers on top.
+        stack is a C-contiguous (layers, packed bytes) uint8 array, rows are read in place.
+        """
+        if not rows:
+            return
+        if stack.shape[1] % 8:
+            # Image does not split into whole 64 pixel words
+            _composite_layers_numpy(final, stack, rows, indices)
+            return
+        rows = np.asarray(rows, dtype=np.intp)
+        indices = np.asarray(indices, dtype=np.uint8)
+        with _composite_lock:
+            _composite_layers_jit(final.reshape(-1), stack.view(np.uint64), rows, indices)
+
+    # Pay the JIT compilation cost once at import time
+    composite_layers(np.zeros((1, 64), dtype=np.uint8), np.zeros((1, 8), dtype=np.uint8), [0], [0])
+else:
+    composite_layers = _composite_layers_numpy
\ No newline at end of file
@@ -27,8 +27,12 @@ class ImageProcessor:
             Optional[np.ndarray]: Binary image (values 0 and 255) at target dimensions,
                                 or None if loading fails
         """
-        # Load image in grayscale
-        image = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+        # Load image in grayscale, raw bytes read in one go and decoded from memory
+        try:
+            buffer = np.fromfile(str(image_path), dtype=np.uint8)
+        except OSError:
+            buffer = None
+        image = cv2.imdecode(buffer, cv2.IMREAD_GRAYSCALE) if buffer is not None and buffer.size else None
         if image is None:
             print(f"Failed to load image: {image_path}")
             return None
@@ -116,8 +120,7 @@ class ImageProcessor:
             
             # Apply index to mask
             index = gray_indexes[gray_value]
-            pixels_to_set = np.sum(mask > 0)
-            combined_image[mask > 0] = index
+            np.putmask(combined_image, mask, index)
             pixels_set = np.sum(combined_image == index)
             print(f"Set {pixels_set} pixels for gray value {gray_value} to index {index}")
         
@@ -1,191 +1,327 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import cv2
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 
 from ..configs.mask_config import MaskConfig
+from ..utils.constants import ensure_dir
 from .image_processor import ImageProcessor
+from ._kernels import composite_layers
+
+# C memcmp stops at the first differing byte, np.array_equal always scans both arrays
+try:
+    _memcmp = ctypes.CDLL(ctypes.util.find_library('c')).memcmp
+    _memcmp.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
+    _memcmp.restype = ctypes.c_int
+except (OSError, AttributeError, TypeError):
+    _memcmp = None
+
+# Frame number at the end of a sequence frame file name, e.g. "..._0042.bmp"
+_FRAME_FILE = re.compile(r'(?:^|_)(\d+)\.bmp$')
+
+def _bmp_header(width: int, height: int) -> bytes:
+    """Headers and grayscale palette of an uncompressed bottom-up 8-bit BMP"""
+    palette = bytes(value for gray in range(256) for value in (gray, gray, gray, 0))
+    offset = 14 + 40 + len(palette)
+    stride = (width + 3) & ~3
+    file_header = struct.pack('<2sIHHI', b'BM', offset + stride * height, 0, 0, offset)
+    info_header = struct.pack('<IiiHHIIiiII', 40, width, height, 1, 8, 0, stride * height, 0, 0, 256, 0)
+    return file_header + info_header + palette
 
 class MaskManager:
-    def __init__(self, config: MaskConfig, panorama_id: str, base_paths: Dict[str, Path], logger=None):
-        """Initialize the MaskManager with configuration and paths"""
+    # Maximum number of recently used sequence frames kept in memory
+    SEQUENCE_CACHE_SIZE = 10
+
+    def __init__(self, config: MaskConfig, panorama_id: str, base_paths: Dict[str, Path], logger=None,
+                 result_prefix: str = ""):
+        """
+        Initialize the MaskManager with configuration and paths.
+        Results are saved as <result_prefix><n>.bmp, managers sharing a results directory need distinct prefixes.
+        """
         self.config = config
         self.panorama_id = panorama_id
         self.base_paths = base_paths
         self.logger = logger
+        self.result_prefix = result_prefix
+        
+        # Gray values painted from highest to lowest for proper layering, with their indexes.
+        # Fixed for the manager's lifetime, create a new manager if the config changes.
+        self._layer_order = [
+            (gray_value, config.gray_indexes[gray_value])
+            for gray_value in sorted(config.gray_values, reverse=True)
+            if gray_value in config.gray_indexes
+        ]
         
         # Cache structures
         self.mask_cache = {}  # Static masks
-        self.sequence_paths = {}  # Paths to sequence frames
-        self.sequence_max_frames = {}  # Max frame numbers for sequences
-        self.sequence_cache = {} # Small cache for recently used sequence frames
-        self.max_sequence_cache = 10 # Maximum number of frames to keep in sequence cache
+        self.static_stack = None  # Static masks stacked (K, H, W/8), backs mask_cache
+        self._static_rows = {}  # gray_value -> row of its static mask in the layer stack
+        self.frame_paths = {}  # (gray_value, seq_num, frame_num) -> path of sequence frame
+        self.sequence_max_frames = {}  # (gray_value, seq_num) -> max frame number
+        
+        # Small LRU cache of recently used sequence frames, keyed like frame_paths
+        self._load_frame = lru_cache(maxsize=self.SEQUENCE_CACHE_SIZE)(self._read_frame)
         
         # State tracking
         self.results_index = 0
         self.previous_mask = None
+        self._previous_layers = None  # frames the previous result was composed of
+        
+        # Working resolution of masks and composites, packed rows need whole bytes
+        height, width = ImageProcessor.TARGET_SIZE
+        self.working_scale = config.working_scale
+        if height % self.working_scale or width % (8 * self.working_scale):
+            raise ValueError(f"Working scale {self.working_scale} does not divide mask size {width}x{height}")
+        self.working_size = (height // self.working_scale, width // self.working_scale)
+        
+        # Result masks are composed into two preallocated buffers in turn,
+        # the other one keeps the previous result for comparison
+        self._result_buffers = tuple(np.empty(self.working_size, dtype=np.uint8) for _ in range(2))
+        self._output_mask = np.empty(ImageProcessor.TARGET_SIZE, dtype=np.uint8) if self.working_scale > 1 else None
+        self._bmp_header = _bmp_header(width, height)
+        
+        # Packed layers of a composite: static masks in the first rows, filled once,
+        # sequence frames copied into the rows after them for each result
+        self._layer_stack = None
+        self._allocate_layer_stack(max(1, len(self._layer_order)))
         
         # Create results directory
         self.results_dir = base_paths['results']
-        self.results_dir.mkdir(exist_ok=True)
+        ensure_dir(self.results_dir)
         if self.logger:
             self.logger.log(f"Results directory: {self.results_dir}")
 
+    def _load_static_mask(self, gray_value: int) -> Optional[np.ndarray]:
+        """Load static mask of a gray value, None if there is none"""
+        # Check both PNG and BMP paths
+        bmp_path = self.base_paths['base'] / f"{self.panorama_id}_{gray_value}.bmp"
+        png_path = self.base_paths['base'] / f"{self.panorama_id}_{gray_value}.png"
+        
+        mask_path = bmp_path if bmp_path.exists() else png_path
+        if not mask_path.exists():
+            return None
+        
+        mask = ImageProcessor.load_and_resize_image(mask_path)
+        if mask is None:
+            return None
+        return self._pack(mask)
+
     def load_static_masks(self):
         """Load all static masks defined in configuration"""
-        for gray_value in self.config.gray_values:
-            # Check both PNG and BMP paths
-            bmp_path = self.base_paths['base'] / f"{self.panorama_id}_{gray_value}.bmp"
-            png_path = self.base_paths['base'] / f"{self.panorama_id}_{gray_value}.png"
-            
-            mask_path = bmp_path if bmp_path.exists() else png_path
-            if mask_path.exists():
-                mask = ImageProcessor.load_and_resize_image(mask_path)
+        # OpenCV releases the GIL while decoding, so masks are loaded in parallel
+        gray_values = self.config.gray_values
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            masks = executor.map(self._load_static_mask, gray_values)
+            for gray_value, mask in zip(gray_values, masks):
                 if mask is not None:
-                    _, binary_mask = cv2.threshold(mask, 127, 255, cv2.THRESH_BINARY)
-                    self.mask_cache[gray_value] = binary_mask
+                    self.mask_cache[gray_value] = mask
                     self.logger.log(f"Loaded static mask for gray value {gray_value}")
-
-    def _get_cache_key(self, gray_value: int, seq_num: int, frame_num: int) -> str:
-        """Generate cache key for sequence frame lookup"""
-        return f"{gray_value}_{seq_num}_{frame_num}"
-
-    def _cache_sequence_frame(self, gray_value: int, seq_num: int, frame_num: int, frame: np.ndarray):
-        """Add sequence frame to cache, removing oldest if needed"""
-        key = self._get_cache_key(gray_value, seq_num, frame_num)
         
-        # Remove oldest frame if cache is full
-        if len(self.sequence_cache) >= self.max_sequence_cache:
-            oldest_key = next(iter(self.sequence_cache))
-            del self.sequence_cache[oldest_key]
-            
-        self.sequence_cache[key] = frame
+        # Static masks never change, keep them in one contiguous block in painting order
+        self._allocate_layer_stack(len(self._layer_stack) - len(self._static_rows))
+
+    def _allocate_layer_stack(self, dynamic_rows: int) -> np.ndarray:
+        """(Re)allocate the layer stack: static masks in painting order, then dynamic_rows free rows"""
+        static_values = sorted(self.mask_cache, reverse=True)
+        height, width = self.working_size
+        stack = np.empty((len(static_values) + dynamic_rows, height * width // 8), dtype=np.uint8)
+        for row, gray_value in enumerate(static_values):
+            stack[row] = self.mask_cache[gray_value].reshape(-1)
+            self.mask_cache[gray_value] = stack[row].reshape(height, width // 8)
         
+        self._static_rows = {gray_value: row for row, gray_value in enumerate(static_values)}
+        self.static_stack = stack[:len(static_values)].reshape(-1, height, width // 8) if static_values else None
+        self._layer_stack = stack
+        return stack
+
+    def _pack(self, mask: np.ndarray) -> np.ndarray:
+        """Threshold a grayscale mask straight to one bit per pixel, 8x less memory to stream when compositing"""
+        if self.working_scale > 1:
+            # Nearest neighbour downsampling to working resolution
+            mask = mask[::self.working_scale, ::self.working_scale]
+        return np.packbits(mask > ImageProcessor.BINARY_THRESHOLD, axis=1)
+
     def scan_sequences(self) -> int:
         """Scan for available sequences without loading frames into memory"""
         total_frames = 0
         
         for gray_value in self.config.gray_values:
             gray_dir = self.base_paths['base'] / f"{self.panorama_id}_{gray_value}"
-            if not gray_dir.exists():
-                continue
-            
-            self.sequence_paths[gray_value] = {}
-            self.sequence_max_frames[gray_value] = {}
+            prefix = f"{self.panorama_id}_{gray_value}_"
             
-            seq_dirs = list(sorted(gray_dir.glob(f"{self.panorama_id}_{gray_value}_*")))
+            # Single directory read per level, no stat or Path object per entry
+            try:
+                with os.scandir(gray_dir) as entries:
+                    seq_dirs = []
+                    for entry in entries:
+                        if entry.name.startswith(prefix) and entry.is_dir():
+                            try:
+                                seq_dirs.append((int(entry.name.rsplit('_', 1)[-1]), entry.path))
+                            except ValueError:
+                                continue
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            seq_dirs.sort()
             
-            for seq_dir in seq_dirs:
-                try:
-                    seq_num = int(seq_dir.name.split('_')[-1])
-                    frame_files = sorted(seq_dir.glob('*.bmp'))
-                    
-                    # Store paths for on-demand loading
-                    frame_paths = {}
-                    max_frame = 0
-                    
-                    for frame_path in frame_files:
-                        try:
-                            frame_num = int(frame_path.stem.split('_')[-1])
-                            frame_paths[frame_num] = frame_path
-                            max_frame = max(max_frame, frame_num)
-                            total_frames += 1
-                        except ValueError:
-                            continue
-                    
-                    if frame_paths:
-                        self.sequence_paths[gray_value][seq_num] = frame_paths
-                        self.sequence_max_frames[gray_value][seq_num] = max_frame
-                        if self.logger:
-                            self.logger.log(f"Found sequence {gray_value}_{seq_num} ({self.panorama_id}). {len(frame_paths)} frames available.")
-                    
-                except ValueError:
-                    continue
+            for seq_num, seq_dir in seq_dirs:
+                # Store paths for on-demand loading
+                frame_files = []
+                with os.scandir(seq_dir) as entries:
+                    for entry in entries:
+                        match = _FRAME_FILE.search(entry.name)
+                        if match:
+                            frame_files.append((int(match.group(1)), entry.path))
+                
+                if frame_files:
+                    for frame_num, frame_path in frame_files:
+                        self.frame_paths[gray_value, seq_num, frame_num] = frame_path
+                    self.sequence_max_frames[gray_value, seq_num] = max(frame_files)[0]
+                    total_frames += len(frame_files)
+                    if self.logger:
+                        self.logger.log(f"Found sequence {gray_value}_{seq_num} ({self.panorama_id}). {len(frame_files)} frames available.")
         
         if self.logger:
             self.logger.log(f"Found total frames: {total_frames}")
         return total_frames
     
     def get_frame(self, gray_value: int, seq_num: int, frame_num: int) -> Optional[np.ndarray]:
-        """Load frame from cache or disk"""
-        # Try sequence cache first
-        cache_key = self._get_cache_key(gray_value, seq_num, frame_num)
-        if cache_key in self.sequence_cache:
-            return self.sequence_cache[cache_key]
-        
-        # Load from disk if not in cache
-        if gray_value not in self.sequence_paths:
-            return None
-            
-        if seq_num not in self.sequence_paths[gray_value]:
-            return None
-            
-        max_frame = self.sequence_max_frames[gray_value].get(seq_num, 0)
+        """Load frame from cache or disk, bit-packed along rows"""
+        max_frame = self.sequence_max_frames.get((gray_value, seq_num), 0)
         if max_frame == 0:
             return None
-            
-        actual_frame = min(frame_num, max_frame)
-        frame_path = self.sequence_paths[gray_value][seq_num].get(actual_frame)
         
-        if frame_path and frame_path.exists():
+        # Frames past the end of a sequence hold its last frame
+        try:
+            return self._load_frame(gray_value, seq_num, min(frame_num, max_frame))
+        except FileNotFoundError:
+            return None
+
+    def _read_frame(self, gray_value: int, seq_num: int, frame_num: int) -> np.ndarray:
+        """
+        Load sequence frame from disk, called through the _load_frame cache.
+        Failures raise instead of returning None so that misses are not cached
+        and a frame still being written is read again next time.
+        """
+        frame_path = self.frame_paths.get((gray_value, seq_num, frame_num))
+        if frame_path and os.path.exists(frame_path):
             frame = ImageProcessor.load_and_resize_image(frame_path)
             if frame is not None:
-                _, binary_frame = cv2.threshold(frame, 127, 255, cv2.THRESH_BINARY)
-                
-                # Add to sequence cache
-                self._cache_sequence_frame(gray_value, seq_num, frame_num, binary_frame)
-                return binary_frame
+                return self._pack(frame)
                 
-        return None
+        raise FileNotFoundError(f"Cannot load sequence frame: {frame_path}")
+
+    def _masks_are_different(self, new_mask: np.ndarray) -> bool:
+        """Check new result mask against the last saved one"""
+        previous = self.previous_mask
+        if previous is None or previous.shape != new_mask.shape:
+            return True
+        if previous is new_mask:
+            return False
+        if _memcmp is None:
+            return not np.array_equal(previous, new_mask)
+        
+        previous = np.ascontiguousarray(previous)
+        new_mask = np.ascontiguousarray(new_mask)
+        return _memcmp(previous.ctypes.data, new_mask.ctypes.data, new_mask.nbytes) != 0
+
+    @staticmethod
+    def _sequences(state, gray_value: int):
+        """Active (seq_num, frame_num) pairs of a gray value, a bare list applies to every gray value"""
+        return state if isinstance(state, list) else state.get(gray_value, ())
 
-    def process_and_save(self, state: Dict[int, List[Tuple[int, int]]]) -> Optional[Path]:
-        """Process current state and save result mask"""
+    def _layers_key(self, state) -> tuple:
+        """Sequence frames a composite for state is made of, frame numbers clamped as in get_frame"""
+        key = []
+        for gray_value, _ in self._layer_order:
+            for seq_num, frame_num in self._sequences(state, gray_value):
+                max_frame = self.sequence_max_frames.get((gray_value, seq_num), 0)
+                if max_frame:
+                    key.append((gray_value, seq_num, min(frame_num, max_frame)))
+        return tuple(key)
+
+    def process_and_save(self, state: Union[Dict[int, List[Tuple[int, int]]], List[Tuple[int, int]]]) -> Optional[Path]:
+        """
+        Process current state and save result mask, returns None if nothing was saved.
+        State maps gray values to active (seq_num, frame_num) pairs, or is a single list used for all gray values.
+        """
         if not state:
             return None
             
-        # Create output mask with background value
-        target_size = (1280, 3840)  # height x width
-        final_mask = np.full(target_size, 255, dtype=np.uint8)
-        
-        # Sort gray values by index (highest to lowest) for proper layering
-        sorted_gray_values = sorted(
-            self.config.gray_values,
-            reverse=True
-        )
-        
-        for gray_value in sorted_gray_values:
-            active_frames = []
-            
+        # Same frames as last time, result would be identical - skip compositing entirely
+        layers_key = self._layers_key(state)
+        if layers_key == self._previous_layers:
+            return None
+        
+        # Reset output mask to background value, in the buffer not holding the previous result
+        first, second = self._result_buffers
+        final_mask = second if self.previous_mask is first else first
+        final_mask.fill(255)
+        
+        # Collect layer rows in painting order, every frame of a gray value carries its index.
+        # Static masks are used in place, only sequence frames are copied into the stack.
+        stack = self._layer_stack
+        static_rows = self._static_rows
+        next_row = len(static_rows)
+        rows = []
+        indices = []
+        for gray_value, index in self._layer_order:
             # Add static mask if exists
-            if gray_value in self.mask_cache:
-                active_frames.append(self.mask_cache[gray_value])
+            static_row = static_rows.get(gray_value)
+            if static_row is not None:
+                rows.append(static_row)
+                indices.append(index)
             
             # Add sequence frames
-            if gray_value in state:
-                for seq_num, frame_num in state[gray_value]:
-                    frame = self.get_frame(gray_value, seq_num, frame_num)
-                    if frame is not None:
-                        active_frames.append(frame)
-            
-            # Combine all frames
-            if active_frames:
-                if len(active_frames) > 1:
-                    combined_mask = np.maximum.reduce(active_frames)
-                else:
-                    combined_mask = active_frames[0]
-                
-                if gray_value in self.config.gray_indexes:
-                    index = self.config.gray_indexes[gray_value]
-                    final_mask[combined_mask > 0] = index
+            for seq_num, frame_num in self._sequences(state, gray_value):
+                frame = self.get_frame(gray_value, seq_num, frame_num)
+                if frame is not None:
+                    if next_row == len(stack):
+                        # More active frames than ever before, double the dynamic rows
+                        previous = stack
+                        stack = self._allocate_layer_stack(2 * (next_row - len(static_rows)))
+                        stack[len(static_rows):next_row] = previous[len(static_rows):next_row]
+                    stack[next_row] = frame.reshape(-1)
+                    rows.append(next_row)
+                    indices.append(index)
+                    next_row += 1
+        
+        # Paint all layers in one sweep over the image
+        composite_layers(final_mask, stack, rows, indices)
+
+        # Nothing to save if the result did not change
+        if not self._masks_are_different(final_mask):
+            self._previous_layers = layers_key
+            return None
 
         # Save result
         next_index = self.results_index + 1
-        result_path = self.results_dir / f"{next_index}.bmp"
-        cv2.imwrite(str(result_path), final_mask)
+        result_path = self.results_dir / f"{self.result_prefix}{next_index}.bmp"
+        composed_mask = final_mask
+        if self._output_mask is not None:
+            # Nearest neighbour upscaling to full resolution, indexes are categorical
+            scale = self.working_scale
+            height, width = self.working_size
+            self._output_mask.reshape(height, scale, width, scale)[:] = final_mask[:, None, :, None]
+            final_mask = self._output_mask
+        
+        with open(result_path, 'wb') as f:
+            # 8-bit grayscale BMP like cv2.imwrite writes: fixed header, then rows bottom-up
+            f.write(self._bmp_header)
+            final_mask[::-1].tofile(f)
         self.results_index = next_index
         
+        # Recorded only once the result is saved, so a failed state is retried in full
+        self.previous_mask = composed_mask
+        self._previous_layers = layers_key
+        
         return result_path
 
     def clear_sequence_cache(self):
         """Clear the sequence frames cache"""
-        self.sequence_cache.clear()
\ No newline at end of file
+        self._load_frame.cache_clear()
\ No newline at end of file
@@ -1,10 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 
 from integration.utils.console_logger import ConsoleLogger
 
 from ..configs.mask_config import MaskConfig
-from apps.generator.utils.dynamic_config import get_project_root
+from apps.generator.utils.constants import ensure_dir, get_base_paths
 from .mask_manager import MaskManager
 
 class TMPLMonitor:
@@ -13,61 +14,71 @@ class TMPLMonitor:
         self.panorama_id = panorama_id
         self.previous_state = None
 
-        # Get project root for absolute paths
-        project_root = get_project_root()
-    
         # Setup paths
-        self.base_paths = {
-            'base': project_root / 'data' / 'landscapes' / panorama_id,
-            'sequences': project_root / 'data' / 'landscapes' / panorama_id / 'sequences',
-            'output': project_root / 'data' / 'landscapes' / panorama_id,
-            'results': project_root / 'results'
-        }
-        self.base_paths['results'].mkdir(exist_ok=True)
+        self.base_paths = get_base_paths(panorama_id)
+        ensure_dir(self.base_paths['results'])
         
-        # Initialize components
+        # Initialize components, results of several configurations are told apart by name
+        shared_results = len(mask_configs) > 1
         self.mask_managers = {
             config.name: MaskManager(
                 config=config, 
                 panorama_id=panorama_id, 
                 base_paths=self.base_paths,
-                logger=logger
+                logger=logger,
+                result_prefix=f"{config.name}_" if shared_results else ""
             )
             for config in mask_configs
         }
+        
+        # Configurations never change after setup, bound once for the monitoring tick
+        self._process_calls = tuple(manager.process_and_save for manager in self.mask_managers.values())
+        
+        # Managers write separately named files, so each one is processed on its own thread:
+        # frame loading and saving overlap, the compositing kernel itself runs one at a time
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.mask_managers)),
+            thread_name_prefix="mask-manager"
+        )
 
-    def process_state(self, state: List[int]):
+    def process_state(self, state: Sequence[int]):
         """Process state for all configurations"""
-        if not state or not any(state):
-            return
-
+        # Immutable snapshot, compared and stored as is without copying.
+        # Unchanged state is by far the most common tick, so it is checked first.
+        state = tuple(state)
         if state == self.previous_state:
             return
 
+        # Create active sequences list, nothing to do if no sequence is active
+        active_sequences = []
+        for seq_num, frame_num in enumerate(state):
+            if frame_num > 0:
+                active_sequences.append((seq_num, frame_num))
+        if not active_sequences:
+            return
+        
+        # Log new active sequences
+        if self.logger:
+            self.logger.log("Active sequences: %s", active_sequences)
+        
+        # Process each configuration in parallel
+        # (the same active sequences apply to every gray value of every configuration)
+        submit = self._executor.submit
         try:
-            # Create active sequences list
-            active_sequences = []
-            for seq_num, frame_num in enumerate(state):
-                if frame_num > 0:
-                    active_sequences.append((seq_num, frame_num))
-            
-            # Log new active sequences
-            if self.logger:
-                self.logger.log(f"Active sequences: {active_sequences}")
-            
-            # Process each configuration
-            for name, manager in self.mask_managers.items():
-                config_state = {}
-                for gray_value in manager.config.gray_values:
-                    config_state[gray_value] = active_sequences
+            futures = [submit(process, active_sequences) for process in self._process_calls]
             
-                result_path = manager.process_and_save(config_state)
+            for future in futures:
+                result_path = future.result()
                 if result_path and self.logger:
-                    self.logger.log(f"Generated: {result_path.name}")
-
-            self.previous_state = state.copy()
+                    self.logger.log("Generated: %s", result_path.name)
         
         except Exception as e:
             if self.logger:
                 self.logger.log(f"Error: {e}")
-            raise
\ No newline at end of file
+            raise
+
+        self.previous_state = state
+
+    def close(self):
+        """Wait for running mask processing and release the worker threads"""
+        self._executor.shutdown(wait=True)
\ No newline at end of file
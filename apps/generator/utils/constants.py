@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, List
 from pathlib import Path
 from apps.generator.utils.dynamic_config import get_project_root
@@ -10,13 +11,27 @@ TARGET_HEIGHT = 1280
 DEFAULT_IMAGE_TYPE = 'bmp'
 
 # Base paths
+@lru_cache(maxsize=1)
+def get_results_dir() -> Path:
+    """Results directory, shared by all panoramas"""
+    return get_project_root() / 'results'
+
+# Directories already created by ensure_dir in this process
+_ENSURED_DIRS = set()
+
+def ensure_dir(path: Path):
+    """Create directory if needed, only the first call for a path touches the filesystem"""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
 def get_base_paths(panorama_id: str) -> Dict[str, Path]:
-    project_root = get_project_root()
+    landscape = get_project_root() / 'data' / 'landscapes' / panorama_id
     return {
-        'base': project_root / 'data' / 'landscapes' / panorama_id,
-        'sequences': project_root / 'data' / 'landscapes' / panorama_id / 'sequences',
-        'output': project_root / 'data' / 'landscapes' / panorama_id,
-        'results': project_root / 'results'
+        'base': landscape,
+        'sequences': landscape / 'sequences',
+        'output': landscape,
+        'results': get_results_dir()
     }
 
 # File monitoring
@@ -1,12 +1,16 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 from typing import Dict, Optional
 
+from apps.generator.utils.dynamic_config import read_mapping_file
+
 class InitializationDiagnostic:
     """Diagnostic tool for checking mask system initialization"""
     
     def __init__(self):
+        # (message template, args) pairs, formatted only when printed
         self.issues = []
         
     def check_project_structure(self, root_path: Path) -> bool:
@@ -18,37 +22,36 @@ class InitializationDiagnostic:
         
         for path in required_paths:
             if not path.exists():
-                self.issues.append(f"Missing required path: {path}")
+                self.issues.append(("Missing required path: {}", (path,)))
                 return False
         return True
         
     def validate_mask_mapping(self, mapping_path: Path) -> Optional[Dict]:
         """Validate the mask mapping configuration"""
         try:
-            with open(mapping_path) as f:
-                mapping = json.load(f)
+            mapping = read_mapping_file(mapping_path)
                 
             # Verify structure
             if not isinstance(mapping, dict):
-                self.issues.append("Mask mapping must be a dictionary")
+                self.issues.append(("Mask mapping must be a dictionary", ()))
                 return None
                 
             for panorama_id, config in mapping.items():
                 if not isinstance(config, dict):
-                    self.issues.append(f"Invalid configuration for panorama {panorama_id}")
+                    self.issues.append(("Invalid configuration for panorama {}", (panorama_id,)))
                     continue
                     
                 required_keys = ['static_masks', 'sequence_masks']
                 for key in required_keys:
                     if key not in config:
-                        self.issues.append(f"Missing {key} in configuration for {panorama_id}")
+                        self.issues.append(("Missing {} in configuration for {}", (key, panorama_id)))
                         return None
                         
                 # Validate mask values
                 for mask_type in ['static_masks', 'sequence_masks']:
                     masks = config[mask_type]
                     if not isinstance(masks, dict):
-                        self.issues.append(f"Invalid {mask_type} format for {panorama_id}")
+                        self.issues.append(("Invalid {} format for {}", (mask_type, panorama_id)))
                         continue
                         
                     for gray_val, index in masks.items():
@@ -56,34 +59,50 @@ class InitializationDiagnostic:
                             int(gray_val)
                             int(index)
                         except ValueError:
-                            self.issues.append(f"Invalid value in {mask_type}: {gray_val} -> {index}")
+                            self.issues.append(("Invalid value in {}: {} -> {}", (mask_type, gray_val, index)))
                             
             return mapping
         except json.JSONDecodeError:
-            self.issues.append(f"Invalid JSON in mask mapping file: {mapping_path}")
+            self.issues.append(("Invalid JSON in mask mapping file: {}", (mapping_path,)))
             return None
         except Exception as e:
-            self.issues.append(f"Error reading mask mapping: {str(e)}")
+            self.issues.append(("Error reading mask mapping: {}", (str(e),)))
+            return None
+            
+    @staticmethod
+    def _list_dir(directory: Path) -> Optional[Dict[str, os.DirEntry]]:
+        """Entries of directory by name, None if it does not exist"""
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name: entry for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
             return None
             
-    def check_panorama_files(self, landscapes_dir: Path, panorama_id: str, mapping: Dict) -> bool:
-        """Verify panorama files exist as specified in mapping"""
+    def check_panorama_files(self, landscapes_dir: Path, panorama_id: str, mapping: Dict,
+                             names: Optional[Dict[str, os.DirEntry]] = None) -> bool:
+        """Verify panorama files exist as specified in mapping, against a prefetched listing if given"""
         panorama_dir = landscapes_dir / panorama_id
-        if not panorama_dir.exists():
-            self.issues.append(f"Panorama directory not found: {panorama_dir}")
+        
+        # One directory read instead of a stat per mask file
+        if names is None:
+            names = self._list_dir(panorama_dir)
+        if names is None:
+            self.issues.append(("Panorama directory not found: {}", (panorama_dir,)))
             return False
             
         # Check static masks
         for gray_val in mapping[panorama_id]['static_masks']:
-            mask_file = panorama_dir / f"{panorama_id}_{gray_val}.png"
-            if not mask_file.exists():
-                self.issues.append(f"Missing static mask file: {mask_file}")
+            mask_name = f"{panorama_id}_{gray_val}.png"
+            if mask_name not in names:
+                self.issues.append(("Missing static mask file: {}", (panorama_dir / mask_name,)))
                 
         # Check sequence directories
         for gray_val in mapping[panorama_id]['sequence_masks']:
-            seq_dir = panorama_dir / f"{panorama_id}_{gray_val}"
-            if not seq_dir.exists():
-                self.issues.append(f"Missing sequence directory: {seq_dir}")
+            seq_name = f"{panorama_id}_{gray_val}"
+            # File type comes from the directory listing, no extra stat
+            entry = names.get(seq_name)
+            if entry is None or not entry.is_dir():
+                self.issues.append(("Missing sequence directory: {}", (panorama_dir / seq_name,)))
                 
         return len(self.issues) == 0
         
@@ -113,9 +132,15 @@ class InitializationDiagnostic:
             
         # Check panorama files
         landscapes_dir = root_path / 'data' / 'landscapes'
+        
+        # Directory listings are read in parallel, checks still run in mapping order
+        workers = max(1, min(len(mapping), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            listings = list(executor.map(self._list_dir, (landscapes_dir / panorama_id for panorama_id in mapping)))
+            
         all_valid = True
-        for panorama_id in mapping:
-            if not self.check_panorama_files(landscapes_dir, panorama_id, mapping):
+        for panorama_id, names in zip(mapping, listings):
+            if not self.check_panorama_files(landscapes_dir, panorama_id, mapping, names):
                 all_valid = False
                 
         if not all_valid:
@@ -124,8 +149,8 @@ class InitializationDiagnostic:
         # Print all issues
         if self.issues:
             print("\nFound the following issues:")
-            for issue in self.issues:
-                print(f"  - {issue}")
+            for template, args in self.issues:
+                print(f"  - {template.format(*args)}")
             return False
             
         print("✅ All initialization checks passed")
@@ -1,10 +1,17 @@
 from pathlib import Path
 import json
+from functools import lru_cache
 from typing import Dict, List, Tuple
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Returns the path to the project root directory"""
+    """Returns the path to the project root directory (looked up once, then cached)"""
     current_file = Path(__file__)
     
     for parent in [current_file, *current_file.parents]:
@@ -13,6 +20,19 @@ def get_project_root() -> Path:
         
     raise RuntimeError("Could not find Generator directory in path hierarchy")
 
+@lru_cache(maxsize=4)
+def _read_json(path: str, mtime_ns: int):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, callers handle both alike
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def read_mapping_file(mapping_file: Path) -> Dict:
+    """Parsed mask mapping file, re-read only when its modification time changes. Treat as read-only."""
+    return _read_json(str(mapping_file), os.stat(mapping_file).st_mtime_ns)
+
 def get_landscapes_dir() -> Path:
     """Returns the path to the landscapes directory"""
     return get_project_root() / 'data' / 'landscapes'
@@ -27,8 +47,7 @@ def load_mask_mapping(panorama_id: str) -> Dict:
     if not mapping_file.exists():
         raise FileNotFoundError(f"Mapping file not found at: {mapping_file}")
         
-    with open(mapping_file, 'r') as f:
-        mappings = json.load(f)
+    mappings = read_mapping_file(mapping_file)
         
     if panorama_id not in mappings:
         raise ValueError(f"No mapping found for panorama {panorama_id}")
@@ -0,0 +1,17 @@
+from functools import lru_cache
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+except ImportError:
+    TurboJPEG = TJPF_RGB = TJSAMP_420 = None
+
+
+@lru_cache(maxsize=1)
+def get_turbojpeg():
+    """Shared TurboJPEG instance, None if PyTurboJPEG or the libturbojpeg library is missing."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError):
+        return None
\ No newline at end of file
@@ -0,0 +1,17 @@
+import sys
+from importlib import import_module
+from typing import Callable, Dict
+
+
+def lazy_getattr(module_name: str, mapping: Dict[str, str]) -> Callable:
+    """
+    Module __getattr__ (PEP 562) that imports name from the relative module
+    mapping[name] on first access and caches it on the package.
+    """
+    def __getattr__(name):
+        if name in mapping:
+            value = getattr(import_module(mapping[name], module_name), name)
+            setattr(sys.modules[module_name], name, value)
+            return value
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+    return __getattr__
\ No newline at end of file
@@ -4,7 +4,7 @@ Licensed under the CC BY-NC-SA 4.0 license (https://creativecommons.org/licenses
 """
 
 from .pix2pix_dataset import Pix2pixDataset
-from .image_folder import make_dataset
+from .image_folder import cached_make_dataset
 
 
 class CustomDataset(Pix2pixDataset):
@@ -37,14 +37,14 @@ class CustomDataset(Pix2pixDataset):
 
     def get_paths(self, opt):
         label_dir = opt.label_dir
-        label_paths = make_dataset(label_dir, recursive=False, read_cache=True)
+        label_paths = cached_make_dataset(label_dir, recursive=False, read_cache=True)
 
         image_dir = opt.image_dir
-        image_paths = make_dataset(image_dir, recursive=False, read_cache=True)
+        image_paths = cached_make_dataset(image_dir, recursive=False, read_cache=True)
 
         if len(opt.instance_dir) > 0:
             instance_dir = opt.instance_dir
-            instance_paths = make_dataset(instance_dir, recursive=False, read_cache=True)
+            instance_paths = cached_make_dataset(instance_dir, recursive=False, read_cache=True)
         else:
             instance_paths = []
 
@@ -11,6 +11,7 @@ Licensed under the CC BY-NC-SA 4.0 license (https://creativecommons.org/licenses
 ###############################################################################
 import torch.utils.data as data
 from PIL import Image
+from functools import lru_cache
 import os
 
 IMG_EXTENSIONS = [
@@ -64,6 +65,26 @@ def make_dataset(dir, recursive=False, read_cache=False, write_cache=False):
     return images
 
 
+@lru_cache(maxsize=16)
+def _make_dataset_cached(dir, dir_mtime_ns, list_mtime_ns, recursive, read_cache):
+    return tuple(make_dataset(dir, recursive=recursive, read_cache=read_cache))
+
+
+def cached_make_dataset(dir, recursive=False, read_cache=False):
+    """make_dataset memoized on the directory and files.list modification times."""
+    try:
+        list_mtime_ns = os.stat(os.path.join(dir, 'files.list')).st_mtime_ns if read_cache else None
+    except OSError:
+        list_mtime_ns = None
+    try:
+        dir_mtime_ns = os.stat(dir).st_mtime_ns
+    except OSError:
+        # Let make_dataset report the invalid directory
+        return make_dataset(dir, recursive=recursive, read_cache=read_cache)
+    # Callers sort the returned list in place, hand out a fresh copy
+    return list(_make_dataset_cached(dir, dir_mtime_ns, list_mtime_ns, recursive, read_cache))
+
+
 def default_loader(path):
     return Image.open(path).convert('RGB')
 
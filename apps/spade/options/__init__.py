@@ -3,12 +3,20 @@ Copyright (C) 2019 NVIDIA Corporation.  All rights reserved.
 Licensed under the CC BY-NC-SA 4.0 license (https://creativecommons.org/licenses/by-nc-sa/4.0/legalcode).
 """
 
-from .base_options import BaseOptions
-from .train_options import TrainOptions
-from .test_options import TestOptions
+from apps.generator.utils.lazy_import import lazy_getattr
+
+# Option classes are imported on first access
+_LAZY_IMPORTS = {
+    'BaseOptions': '.base_options',
+    'TrainOptions': '.train_options',
+    'TestOptions': '.test_options',
+}
 
 __all__ = [
     'BaseOptions',
     'TrainOptions', 
     'TestOptions'
-]
\ No newline at end of file
+]
+
+
+__getattr__ = lazy_getattr(__name__, _LAZY_IMPORTS)
\ No newline at end of file
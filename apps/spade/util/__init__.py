@@ -3,10 +3,19 @@ Copyright (C) 2019 NVIDIA Corporation.  All rights reserved.
 Licensed under the CC BY-NC-SA 4.0 license (https://creativecommons.org/licenses/by-nc-sa/4.0/legalcode).
 """
 
+from apps.generator.utils.lazy_import import lazy_getattr
+
 from .util import *
-from .html import HTML
-from .visualizer import Visualizer
-from .iter_counter import IterationCounter
-from .coco import id2label
 
-__all__ = ['HTML', 'Visualizer', 'IterationCounter', 'id2label']
\ No newline at end of file
+# html and visualizer need dominate and scipy, only import them on first access
+_LAZY_IMPORTS = {
+    'HTML': '.html',
+    'Visualizer': '.visualizer',
+    'IterationCounter': '.iter_counter',
+    'id2label': '.coco',
+}
+
+__all__ = ['HTML', 'Visualizer', 'IterationCounter', 'id2label']
+
+
+__getattr__ = lazy_getattr(__name__, _LAZY_IMPORTS)
\ No newline at end of file
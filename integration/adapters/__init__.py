@@ -2,7 +2,15 @@
 SPADE and Depth Mask Adapter
 """
 
-from .depth_mask_adapter import DepthMaskAdapter
-from .spade_adapter import SpadeAdapter
+from apps.generator.utils.lazy_import import lazy_getattr
 
-__all__ = ['DepthMaskAdapter', 'SpadeAdapter']
\ No newline at end of file
+# Adapters pull in depthai, cv2 and torch, so they are imported on first access
+_LAZY_IMPORTS = {
+    'DepthMaskAdapter': '.depth_mask_adapter',
+    'SpadeAdapter': '.spade_adapter',
+}
+
+__all__ = ['DepthMaskAdapter', 'SpadeAdapter']
+
+
+__getattr__ = lazy_getattr(__name__, _LAZY_IMPORTS)
\ No newline at end of file
@@ -1,20 +1,47 @@
 import depthai as dai
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 import cv2
-import json
+import numpy as np
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 
 from apps.depth_tracking.config import Config
+from apps.depth_tracking.depth_frame import DepthFrame
 from apps.depth_tracking.depth_tracker import DepthTracker
 from apps.depth_tracking.visualizer import Visualizer
 from apps.depth_tracking.column_analyzer import ColumnAnalyzer
 from apps.generator.core.tmpl_monitor import TMPLMonitor
 from apps.generator.configs.mask_config import MaskConfig
-from apps.generator.utils.dynamic_config import get_project_root
+from apps.generator.utils.dynamic_config import get_project_root, read_mapping_file
 from apps.generator.utils.diagnostic import InitializationDiagnostic
 from ..utils.console_logger import ConsoleLogger
 
+# ROI depth in millimeters, read in C instead of a per-element Python frame
+_spatial_z = attrgetter('spatialCoordinates.z')
+
+
+@lru_cache(maxsize=8)
+def build_roi_configs(nH: int, nV: int) -> Tuple['dai.SpatialLocationCalculatorConfigData', ...]:
+    """Spatial calculator configs for an nH x nV grid, row-major (built once per grid size)"""
+    # Grid cells as (x0, y0, x1, y1), computed in one pass
+    xs = np.linspace(0, 1, nH + 1, dtype=np.float32)
+    ys = np.linspace(0, 1, nV + 1, dtype=np.float32)
+    y0, x0 = np.meshgrid(ys[:-1], xs[:-1], indexing='ij')
+    y1, x1 = np.meshgrid(ys[1:], xs[1:], indexing='ij')
+    rois = np.stack((x0, y0, x1, y1), axis=-1).reshape(-1, 4).tolist()
+
+    configs = []
+    for x0, y0, x1, y1 in rois:
+        config = dai.SpatialLocationCalculatorConfigData()
+        config.depthThresholds.lowerThreshold = 200
+        config.depthThresholds.upperThreshold = 10000
+        config.roi = dai.Rect(dai.Point2f(x0, y0), dai.Point2f(x1, y1))
+        configs.append(config)
+    return tuple(configs)
+
 
 class DepthMaskAdapter:
     """
@@ -40,6 +67,7 @@ class DepthMaskAdapter:
         self.last_process_time = 0.0
         
         # Mask system components
+        self.tmpl_monitor: Optional[TMPLMonitor] = None
         self._initialize_mask_system()
 
     def _initialize_mask_system(self, panorama_id=None):
@@ -57,9 +85,8 @@ class DepthMaskAdapter:
             if not mapping_path.exists():
                 raise FileNotFoundError(f"Mapping file not found at: {mapping_path}")
                 
-            # Load mask mapping
-            with open(mapping_path) as f:
-                mask_mappings = json.load(f)
+            # Load mask mapping (already parsed by the diagnostic above)
+            mask_mappings = read_mapping_file(mapping_path)
                 
             # Create mask config from first panorama
             panorama_id = panorama_id or next(iter(mask_mappings.keys()))
@@ -67,13 +94,16 @@ class DepthMaskAdapter:
             
             # Combine static and sequence masks
             all_masks = {**mapping['static_masks'], **mapping['sequence_masks']}
+            gray_indexes = {int(k): v for k, v in all_masks.items()}
             mask_config = MaskConfig(
                 name="depth_generated",
-                gray_values=list(map(int, all_masks.keys())),
-                gray_indexes={int(k): v for k, v in all_masks.items()}
+                gray_values=list(gray_indexes),
+                gray_indexes=gray_indexes
             )
             
-            # Initialize monitor with our config
+            # Initialize monitor with our config, replacing the one of the previous panorama
+            if self.tmpl_monitor:
+                self.tmpl_monitor.close()
             self.tmpl_monitor = TMPLMonitor(
                 panorama_id=panorama_id,
                 mask_configs=[mask_config],
@@ -93,15 +123,19 @@ class DepthMaskAdapter:
         """Initialize and load all masks"""
         self.logger.log("Loading masks...")
         
-        for name, manager in self.tmpl_monitor.mask_managers.items():
-            manager.load_static_masks()
-            
-        self.logger.log("Loading sequence frames...")
-        total_frames = 0
-        for name, manager in self.tmpl_monitor.mask_managers.items():
-            frames = manager.scan_sequences()
-            total_frames += frames
-            self.logger.log(f"Loaded {frames} frames for {name}")
+        # Sequence directory scans run in the background while static masks load
+        with ThreadPoolExecutor() as executor:
+            scans = {}
+            for name, manager in self.tmpl_monitor.mask_managers.items():
+                scans[name] = executor.submit(manager.scan_sequences)
+                manager.load_static_masks()
+                
+            self.logger.log("Loading sequence frames...")
+            total_frames = 0
+            for name, scan in scans.items():
+                frames = scan.result()
+                total_frames += frames
+                self.logger.log(f"Loaded {frames} frames for {name}")
             
         self.logger.log(f"Total frames loaded: {total_frames}")
 
@@ -133,20 +167,12 @@ class DepthMaskAdapter:
         # Configure stereo depth
         stereo.setDefaultProfilePreset(dai.node.StereoDepth.PresetMode.DEFAULT)
         stereo.setLeftRightCheck(True)
-        stereo.setSubpixel(True)
+        stereo.setSubpixel(self.config.SUBPIXEL)
         spatial_calc.inputConfig.setWaitForMessage(False)
 
-        # Configure ROIs for spatial calculator
-        for y in range(self.config.nV):
-            for x in range(self.config.nH):
-                config = dai.SpatialLocationCalculatorConfigData()
-                config.depthThresholds.lowerThreshold = 200
-                config.depthThresholds.upperThreshold = 10000
-                config.roi = dai.Rect(
-                    dai.Point2f(x/self.config.nH, y/self.config.nV),
-                    dai.Point2f((x+1)/self.config.nH, (y+1)/self.config.nV)
-                )
-                spatial_calc.initialConfig.addROI(config)
+        # Configure ROIs for spatial calculator (reused across initialize() retries)
+        for config in build_roi_configs(self.config.nH, self.config.nV):
+            spatial_calc.initialConfig.addROI(config)
 
         # Link nodes
         mono_left.out.link(stereo.left)
@@ -185,57 +211,64 @@ class DepthMaskAdapter:
         if not self.spatial_calc_queue or not self.depth_queue:
             raise RuntimeError("Device not initialized")
 
+        config = self.config
+        mirror = config.MIRROR_MODE
+
         # Get depth data
         spatial_data = self.spatial_calc_queue.get().getSpatialLocations()
-        distances = [data.spatialCoordinates.z / 1000 for data in spatial_data]
+        distances = np.fromiter(map(_spatial_z, spatial_data),
+                                dtype=np.float32, count=len(spatial_data))
+        distances *= 1 / 1000
         
         # Process depth data
-        column_presence = self.column_analyzer.analyze_columns(distances, self.config.MIRROR_MODE)
+        depth_frame = DepthFrame.from_distances(distances, config, mirror)
+        column_presence = self.column_analyzer.analyze_columns(depth_frame)
         self.depth_tracker.update(column_presence)
 
         # Get current counters for mask system
-        counters = self.depth_tracker.position_counters
+        counters = self.depth_tracker.position_counters.tolist()
 
         # Update console stats
-        stats = {
-            "Mirror": "ON" if self.config.MIRROR_MODE else "OFF",
-            "Columns": ",".join(map(str, column_presence)),
-            "Counters": str(list(counters))
-        }
-        self.logger.update_stats(stats)
+        if config.SHOW_STATS:
+            stats = {
+                "Mirror": "ON" if mirror else "OFF",
+                "Columns": ",".join(map(str, depth_frame.presence)),
+                "Counters": str(counters)
+            }
+            self.logger.update_stats(stats)
 
         # Process masks if there are active positions and enough time has passed
         current_time = time.time()
         
         # Convert counters to proper state format for mask processing
-        active_sequences = []
+        active_sequences = [(column, count) for column, count in enumerate(counters) if count]
         
-        for column, count in enumerate(counters):
-            if count > 0:
-                active_sequences.append((column, count))
-                
-        if active_sequences and (current_time - self.last_process_time >= self.config.COUNTER_INCREMENT_INTERVAL):
+        if active_sequences and (current_time - self.last_process_time >= config.COUNTER_INCREMENT_INTERVAL):
             try:
                 self.tmpl_monitor.process_state(counters)
                 self.last_process_time = current_time
             except Exception as e:
-                self.logger.log(f"Error processing mask: {e}")
+                self.logger.log("Error processing mask: %s", e)
 
         # Create visualization if enabled
         heatmap = None
-        if self.config.DISPLAY_WINDOW:
-            heatmap = self.visualizer.create_heatmap(distances, self.config.MIRROR_MODE)
+        if config.DISPLAY_WINDOW:
+            heatmap = self.visualizer.create_heatmap(depth_frame)
 
         return {
             'distances': distances,
-            'column_presence': column_presence,
+            'depth_frame': depth_frame,
+            'column_presence': depth_frame.presence,
             'counters': counters,
-            'active_positions': list(self.depth_tracker.position_timers.keys()),
+            'active_positions': self.depth_tracker.active_positions,
             'active_sequences': active_sequences
         }, heatmap
 
     def cleanup(self):
         """Clean up resources."""
+        self.depth_tracker.close()
+        if self.tmpl_monitor:
+            self.tmpl_monitor.close()
         if self.device:
             self.device.close()
             self.device = None
\ No newline at end of file
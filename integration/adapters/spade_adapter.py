@@ -1,17 +1,20 @@
 from typing import Optional, Union, List
 import torch
 import os
+from concurrent.futures import ThreadPoolExecutor
 import sys
 from pathlib import Path
 import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 from apps.generator.utils.dynamic_config import get_project_root
+from apps.generator.utils.jpeg import get_turbojpeg, TJSAMP_420
 from apps.spade.options.test_options import TestOptions
 from apps.spade.models.pix2pix_model import Pix2PixModel
 
 class SpadeAdapter:
-    def __init__(self, device_type: str = 'auto', logger=None, bypass_spade: bool = False, colormap: str = 'viridis'):
+    def __init__(self, device_type: str = 'auto', logger=None, bypass_spade: bool = False, colormap: str = 'viridis',
+                 compile_model: bool = False, half_precision: bool = False):
         """
         Initialize SPADE adapter for processing masks.
         
@@ -20,11 +23,27 @@ class SpadeAdapter:
             logger: Optional logger instance for logging
             bypass_spade: If True, bypass SPADE and directly colorize masks
             colormap: Colormap to use when bypassing SPADE
+            compile_model: If True, compile the generator with torch.compile on CUDA
+                (the first masks of each batch shape pay the compilation time)
+            half_precision: If True, keep the generator weights in FP16 on CUDA
         """
         self.logger = logger
         self.device = self._setup_device(device_type)
         self.bypass_spade = bypass_spade
         self.colormap = colormap
+        self.compile_model = compile_model
+        self.half_precision = half_precision
+        # Colormap sampled once as uint8 BGR entries, plus the possible mask levels
+        self._colormap_bgr = self._sample_colormap(colormap)
+        self._levels = np.arange(256, dtype=np.float64)
+        # (height, width) -> (host staging, device label) tensors, reused across masks
+        self._label_buffers = {}
+        # (batch, height, width) -> (instance, image) zero inputs on the device, never written
+        self._zero_inputs = {}
+        # Mask decodes and result writes, overlapped with generation
+        self._io_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        # libjpeg-turbo encoder if available, OpenCV otherwise
+        self._jpeg = get_turbojpeg()
         
         if self.logger:
             self.logger.log(f"Using device: {self.device}")
@@ -67,10 +86,73 @@ class SpadeAdapter:
         
         sys.argv = original_argv
         
+        if self.device.type == 'cuda':
+            # Inference already runs under autocast, FP16 weights skip the per-layer casts
+            if self.half_precision:
+                model.half()
+            # Fixed shapes per batch size, so CUDA graphs can be replayed
+            if self.compile_model and hasattr(torch, 'compile'):
+                model = torch.compile(model, mode='reduce-overhead', dynamic=False)
+        
         if self.logger:
             self.logger.log("Model initialized successfully")
         return model
     
+    def _upload_labels(self, masks: List[np.ndarray]) -> torch.Tensor:
+        """
+        Copy equally sized masks into the persistent (N, 1, H, W) label tensor on the device.
+        Buffers are allocated once per batch shape; on CUDA the host side is
+        pinned so the upload runs asynchronously.
+        """
+        shape = (len(masks), *masks[0].shape)
+        buffers = self._label_buffers.get(shape)
+        if buffers is None:
+            stage = torch.empty(shape[0], 1, *shape[1:], pin_memory=self.device.type == 'cuda')
+            label = stage if self.device.type == 'cpu' else torch.empty(stage.shape, device=self.device)
+            buffers = self._label_buffers[shape] = (stage, label)
+        stage, label = buffers
+        stage[:, 0].copy_(torch.from_numpy(np.stack(masks)))
+        if label is not stage:
+            label.copy_(stage, non_blocking=True)
+        return label
+
+    def _generate(self, masks: List[np.ndarray]) -> List[np.ndarray]:
+        """Run equally sized masks through SPADE in one forward pass, returning BGR images."""
+        shape = (len(masks), *masks[0].shape)
+        zeros = self._zero_inputs.get(shape)
+        if zeros is None:
+            batch, height, width = shape
+            zeros = self._zero_inputs[shape] = (torch.zeros(batch, device=self.device),
+                                                torch.zeros(batch, 3, height, width, device=self.device))
+        data = {
+            'label': self._upload_labels(masks),
+            'instance': zeros[0],
+            'image': zeros[1]
+        }
+
+        # Generate
+        with torch.no_grad():
+            if self.device.type == 'cuda':
+                with torch.cuda.amp.autocast():
+                    generated = self.model(data, mode='inference')
+            else:
+                generated = self.model(data, mode='inference')
+
+        # RGB to BGR and channels last while still on the device, so the
+        # host arrays can be written as they are
+        if generated.shape[1] == 3:
+            generated = generated.flip(1).permute(0, 2, 3, 1).contiguous()
+
+        # Convert to uint8 images
+        imgs = ((generated.cpu().numpy() * 0.5 + 0.5) * 255).clip(0, 255).astype(np.uint8)
+        return list(imgs)
+
+    @staticmethod
+    def _sample_colormap(name: str) -> np.ndarray:
+        """All entries of a matplotlib colormap as an (N, 3) uint8 BGR table."""
+        colormap = plt.get_cmap(name)
+        return (colormap(np.arange(colormap.N))[:, 2::-1] * 255).astype(np.uint8)
+
     def _colorize_mask(self, mask: np.ndarray) -> np.ndarray:
         """
         Colorize a grayscale mask using the specified colormap.
@@ -79,22 +161,20 @@ class SpadeAdapter:
             mask: Grayscale mask array
             
         Returns:
-            Colorized mask as RGB image
+            Colorized mask as BGR image
         """
-        # Normalize mask to 0-1 range
-        min_val, max_val = np.min(mask), np.max(mask)
+        # Normalize mask levels to 0-1 range and map them to colormap entries
+        # (256 levels at most, so the image itself is only indexed once)
+        min_val, max_val = int(np.min(mask)), int(np.max(mask))
         
         if min_val == max_val:
-            mask_norm = np.zeros_like(mask, dtype=float)
+            entries = np.zeros(256, dtype=np.intp)
         else:
-            mask_norm = (mask - min_val) / (max_val - min_val)
+            entries = (self._levels - min_val) / (max_val - min_val) * len(self._colormap_bgr)
+            entries = np.clip(entries, 0, len(self._colormap_bgr) - 1).astype(np.intp)
 
         # Apply colormap
-        colormap = plt.get_cmap(self.colormap)
-        colored = colormap(mask_norm)
-        colored_rgb = (colored[:, :, :3] * 255).astype(np.uint8)
-        
-        return colored_rgb
+        return self._colormap_bgr[entries][mask]
         
     def process_mask(self, mask_path: Union[str, Path], output_path: Union[str, Path]) -> bool:
         """
@@ -107,65 +187,98 @@ class SpadeAdapter:
         Returns:
             bool: True if successful
         """
-        try:
-            if self.logger:
-                self.logger.log(f"Processing mask: {mask_path}")
-
-            # Load mask
-            mask = cv2.imread(str(mask_path), cv2.IMREAD_GRAYSCALE)
-            if mask is None:
-                if self.logger:
-                    self.logger.log(f"Failed to load mask: {mask_path}")
-                return False
-
-            if self.bypass_spade:
-                # Direct colorization
-                img = self._colorize_mask(mask)
-            else:
-                # Prepare data
-                mask_tensor = torch.from_numpy(mask).unsqueeze(0).float().to(self.device)
-                data = {
-                    'label': mask_tensor.unsqueeze(0),
-                    'instance': torch.zeros(1).to(self.device),
-                    'image': torch.zeros(1, 3, mask.shape[0], mask.shape[1]).to(self.device)
-                }
-
-                # Generate
-                with torch.no_grad():
-                    if self.device.type == 'cuda':
-                        with torch.cuda.amp.autocast():
-                            generated = self.model(data, mode='inference')
-                    else:
-                        generated = self.model(data, mode='inference')
-
-                # Process and save output
-                img = ((generated[0].cpu().numpy() * 0.5 + 0.5) * 255).clip(0, 255).astype(np.uint8)
-                if img.shape[0] == 3:
-                    img = img.transpose(1, 2, 0)
-    
-                # Cleanup
-                del generated, data
-                if self.device.type == 'cuda':
-                    torch.cuda.empty_cache()
-                elif self.device.type == 'mps':
-                    torch.mps.empty_cache()
- 
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        return self.process_batch([mask_path], [output_path])[0]
+
+    def process_batch(self, mask_paths: List[Union[str, Path]], output_paths: List[Union[str, Path]],
+                      batch: int = 8) -> List[bool]:
+        """
+        Process segmentation masks through SPADE, up to batch equally sized masks per forward pass.
+        
+        Args:
+            mask_paths: Input mask paths
+            output_paths: Output image paths, one per mask
+            batch: Maximum number of masks per forward pass
             
-            # Save result
-            cv2.imwrite(str(output_path), cv2.cvtColor(img, cv2.COLOR_RGB2BGR), 
-                       [cv2.IMWRITE_JPEG_QUALITY, 95])
+        Returns:
+            List[bool]: True for each mask processed successfully
+        """
+        results = [False] * len(mask_paths)
+        chunks = [range(start, min(start + batch, len(mask_paths))) for start in range(0, len(mask_paths), batch)]
+        pending = self._read_masks(mask_paths, chunks[0]) if chunks else []
+        writes = []
+        for k, indices in enumerate(chunks):
+            reads = pending
+            # Decode the next batch while this one is generated
+            pending = self._read_masks(mask_paths, chunks[k + 1]) if k + 1 < len(chunks) else []
+            try:
+                # Load masks
+                masks = {}
+                for i, read in reads:
+                    if self.logger:
+                        self.logger.log(f"Processing mask: {mask_paths[i]}")
+                    mask = read.result()
+                    if mask is None:
+                        if self.logger:
+                            self.logger.log(f"Failed to load mask: {mask_paths[i]}")
+                        continue
+                    masks[i] = mask
 
-            if self.logger:
-                self.logger.log(f"Saved result to: {output_path}")
+                if self.bypass_spade:
+                    # Direct colorization
+                    imgs = {i: self._colorize_mask(mask) for i, mask in masks.items()}
+                else:
+                    # One forward pass per mask size in the batch
+                    by_shape = {}
+                    for i, mask in masks.items():
+                        by_shape.setdefault(mask.shape, []).append(i)
+                    imgs = {}
+                    for group in by_shape.values():
+                        imgs.update(zip(group, self._generate([masks[i] for i in group])))
 
-            return True
-            
-        except Exception as e:
-            error_msg = f"Error processing mask: {e}"
-            if self.logger:
-                self.logger.log(error_msg)
-            else:
-                print(error_msg)
-            return False
\ No newline at end of file
+                # Encode and write in the background
+                for i, img in sorted(imgs.items()):
+                    writes.append((i, self._io_pool.submit(self._save_image, img, output_paths[i])))
+                
+            except Exception as e:
+                self._log_error(e)
+
+        # Writes finish before returning, so callers may move or delete outputs right away
+        for i, write in writes:
+            try:
+                results[i] = write.result()
+            except Exception as e:
+                self._log_error(e)
+        return results
+
+    def _read_masks(self, mask_paths: List[Union[str, Path]], indices: range) -> list:
+        """Submit grayscale decodes of the given masks, as (index, future) pairs."""
+        return [(i, self._io_pool.submit(cv2.imread, str(mask_paths[i]), cv2.IMREAD_GRAYSCALE))
+                for i in indices]
+
+    def _save_image(self, img: np.ndarray, output_path: Union[str, Path]) -> bool:
+        """Write BGR image as JPEG."""
+        # Ensure output directory exists
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        # Save result
+        if self._jpeg is not None and img.ndim == 3:
+            # Same quality and 4:2:0 subsampling as OpenCV's default
+            with open(output_path, 'wb') as f:
+                f.write(self._jpeg.encode(img, quality=95, jpeg_subsample=TJSAMP_420))
+        else:
+            cv2.imwrite(str(output_path), img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+
+        if self.logger:
+            self.logger.log(f"Saved result to: {output_path}")
+        return True
+
+    def _log_error(self, e: Exception):
+        error_msg = f"Error processing mask: {e}"
+        if self.logger:
+            self.logger.log(error_msg)
+        else:
+            print(error_msg)
+
+    def close(self):
+        """Wait for pending mask I/O and release the I/O threads."""
+        self._io_pool.shutdown(wait=True)
\ No newline at end of file
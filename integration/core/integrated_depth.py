@@ -32,6 +32,7 @@ class IntegratedDepth:
         """Update adapter configuration from IntegratedConfig"""
         self.adapter.config.COUNTER_INCREMENT_INTERVAL = config.counter_increment_interval
         self.adapter.config.MIRROR_MODE = config.mirror_mode
+        self.adapter.config.SUBPIXEL = config.subpixel
         self.adapter.config.DISPLAY_WINDOW = config.display_window
         self.adapter.config.SHOW_STATS = config.show_stats
         self.adapter.config.SHOW_CONSOLE_PREVIEW = config.show_visualization
@@ -78,9 +79,8 @@ class IntegratedDepth:
                     
                     if self.config.show_visualization:
                         self.prev_buffer = self.adapter.visualizer.create_console_heatmap(
-                            frame_data['distances'], 
-                            self.prev_buffer, 
-                            self.config.mirror_mode
+                            frame_data['depth_frame'], 
+                            self.prev_buffer
                         )
                     
                     with self._lock:
@@ -160,10 +160,11 @@ class IntegratedDisplay:
         return True
 
     def _load_next_frame(self, current_time: float):
-        if self.sequence_player.frame_buffer.empty():
+        item = self.sequence_player.take_frame()
+        if item is None:
             return
             
-        _, texture = self.sequence_player.frame_buffer.get()
+        _, texture = item
         
         # Cleanup previous texture
         if self.current_texture:
@@ -226,7 +227,7 @@ class IntegratedDisplay:
         panorama_id = next_seq['image_directory'].split('/')[-2]
         
         # Reset
-        self.depth_adapter.depth_tracker.position_counters = [0] * len(self.depth_adapter.depth_tracker.position_counters)
+        self.depth_adapter.depth_tracker.reset_counters()
         self.sequence_player.start_loader_thread(1)
         
         for file in self.config.spade_output_dir.glob('*.jpg'):
@@ -259,6 +260,7 @@ class IntegratedDisplay:
             self.depth_system.stop()
             
         if self.spade_system:
+            self.spade_system.adapter.close()
             self.spade_system.adapter.model = None
             
         if self.sequence_player:
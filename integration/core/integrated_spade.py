@@ -1,11 +1,15 @@
 import time
 import os
 from pathlib import Path
+from typing import List
 from ..config import IntegratedConfig
 from ..adapters import SpadeAdapter
 from ..utils.console_logger import ConsoleLogger
 
 class IntegratedSpade:
+    # Pending masks processed per SPADE forward pass
+    BATCH_SIZE = 8
+
     def __init__(self, config: IntegratedConfig):
         self.logger = ConsoleLogger(name="Spade")
         self.config = config
@@ -16,7 +20,9 @@ class IntegratedSpade:
             device_type=config.spade_device_type,
             logger=self.logger,
             bypass_spade=config.bypass_spade,
-            colormap=config.colormap
+            colormap=config.colormap,
+            compile_model=config.spade_compile,
+            half_precision=config.spade_half_precision
         )
 
         # Ensure directories exist
@@ -41,23 +47,23 @@ class IntegratedSpade:
             if not mask_files:
                 return
                 
-            # Process oldest file
-            mask_file = mask_files[0]
+            # Process oldest files, one batch at a time
+            batch = mask_files[:self.BATCH_SIZE]
             
             try:
                 # Try to process
-                if self.process_mask(mask_file.name):
+                results = self.process_masks([mask_file.name for mask_file in batch])
+            except:
+                # If any error occurs during processing, just try to delete and continue
+                results = [True] * len(batch)
+                
+            for mask_file, done in zip(batch, results):
+                if done:
                     # If successful, delete the input file
                     try:
                         os.remove(mask_file)
                     except:
                         pass  # Ignore deletion errors
-            except:
-                # If any error occurs during processing, just try to delete and continue
-                try:
-                    os.remove(mask_file)
-                except:
-                    pass
 
         except Exception as e:
             self.logger.log(f"Error in processing loop: {e}")
@@ -70,4 +76,18 @@ class IntegratedSpade:
         if not input_path.exists():
             return False
             
-        return self.adapter.process_mask(input_path, output_path)
\ No newline at end of file
+        return self.adapter.process_mask(input_path, output_path)
+
+    def process_masks(self, mask_filenames: List[str]) -> List[bool]:
+        """Process mask files in one SPADE batch, in order."""
+        input_paths = [self.config.spade_input_dir / name for name in mask_filenames]
+        # Missing files are skipped without taking an output filename
+        present = [i for i, path in enumerate(input_paths) if path.exists()]
+        output_paths = [self.config.spade_output_dir / self._get_next_filename() for _ in present]
+        
+        results = [False] * len(mask_filenames)
+        processed = self.adapter.process_batch([input_paths[i] for i in present], output_paths,
+                                               batch=self.BATCH_SIZE)
+        for i, done in zip(present, processed):
+            results[i] = done
+        return results
\ No newline at end of file
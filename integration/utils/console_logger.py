@@ -22,10 +22,11 @@ class ConsoleLogger:
         
         TerminalUtils.move_cursor(1, self.grid_height + 11)
         print(f"Mirror: {stats['Mirror']} | Columns: {stats['Columns']} | Counters: {stats['Counters']}")
+        TerminalUtils.flush()
 
-    def log(self, message: str):
-        """Log message to file only"""
-        self.file_logger.log(message)
+    def log(self, message: str, *args):
+        """Log message to file only. Optional args are %-formatted only if the record is emitted."""
+        self.file_logger.log(message, *args)
 
     def _initialize_stats_area(self):
         TerminalUtils.move_cursor(1, self.grid_height + 4)
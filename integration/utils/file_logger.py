@@ -27,5 +27,5 @@ class FileLogger:
            
            self.logger.addHandler(file_handler)
 
-   def log(self, message: str):
-       self.logger.info(message)
\ No newline at end of file
+   def log(self, message: str, *args):
+       self.logger.info(message, *args)
\ No newline at end of file